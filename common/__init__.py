@@ -103,6 +103,13 @@ from .cache import (
     build_cache_key,
     build_cache_key_simple,
 )
+from .redis_memo import (
+    async_memoize,
+    build_memo_key,
+    get_redis_client,
+    memo_get_many,
+    memo_set_many,
+)
 from .dcap import (
     DCAPConfig,
     ToolSignature,
@@ -193,6 +200,12 @@ __all__ = [
     "get_cache",
     "build_cache_key",
     "build_cache_key_simple",
+    # Redis Memoization
+    "async_memoize",
+    "build_memo_key",
+    "get_redis_client",
+    "memo_get_many",
+    "memo_set_many",
     # PHI Handling
     "redact_phi",
     "is_phi_field",
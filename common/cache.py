@@ -36,6 +36,9 @@ class Cache:
         value = cache.get("key")
     """
 
+    # Values live in this process and are returned by reference (not serialized)
+    is_local = True
+
     def __init__(self):
         """Initialize an empty cache."""
         self._store: Dict[str, CacheEntry] = {}
@@ -48,6 +48,9 @@ class ServerConfig:
     3. Return a list of ConfigIssue objects for any problems found
     """
 
+    # Empty slots so subclasses that declare their own slots carry no __dict__
+    __slots__ = ()
+
     def validate(self) -> List[ConfigIssue]:
         """
         Validate configuration and return a list of issues.
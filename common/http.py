@@ -73,6 +73,7 @@ class CallOptions:
     backoff_max: float = 60.0  # Maximum delay
     backoff_multiplier: float = 2.0
     verify: Union[bool, str] = True  # SSL verification
+    session: Optional[Any] = None  # Optional requests.Session for connection pooling (sync only)
     # Cache hooks (for future integration - not used yet)
     cache_key_builder: Optional[Callable[[str, Dict[str, Any]], str]] = None  # Optional function to build cache key
     cache_ttl_seconds: Optional[int] = None  # Optional TTL for caching responses (None = no caching)
@@ -215,7 +216,7 @@ def call_upstream(options: CallOptions):
     def _make_request() -> requests.Response:
         """Inner function to make the actual HTTP request."""
         try:
-            response = requests.request(**request_kwargs)
+            response = (options.session or requests).request(**request_kwargs)
             
             # Raise error for non-2xx status codes
             if not response.ok:
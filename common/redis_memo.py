@@ -0,0 +1,188 @@
+"""
+Redis-backed memoization for async upstream calls.
+
+Results are shared across server processes and restarts, so a repeated query
+costs one Redis GET instead of a full HTTPS round-trip to the upstream API.
+Memoization is a pure optimization: when Redis is not configured, not
+installed, or unreachable, the wrapped coroutine is simply awaited.
+
+Usage:
+    from common.redis_memo import async_memoize
+
+    @async_memoize("my-server:search", ttl=60)
+    async def search(query: str) -> Dict[str, Any]:
+        ...
+
+Redis is configured with the REDIS_URL environment variable
+(e.g. redis://localhost:6379/0).
+"""
+
+import functools
+import hashlib
+import json
+import os
+from typing import Any, Awaitable, Callable, Dict, List, Optional, TypeVar
+
+try:
+    import redis.asyncio as aioredis
+except ImportError:
+    aioredis = None  # type: ignore
+
+try:
+    import orjson
+except ImportError:
+    orjson = None  # type: ignore
+
+from .logging import get_logger
+
+logger = get_logger(__name__)
+
+T = TypeVar("T")
+
+
+@functools.lru_cache(maxsize=1)
+def get_redis_client() -> Optional[Any]:
+    """
+    Get the shared async Redis client, created on first use.
+
+    Returns:
+        redis.asyncio.Redis instance, or None if REDIS_URL is unset or the
+        redis package is not installed
+    """
+    url = os.getenv("REDIS_URL")
+    if not url or aioredis is None:
+        return None
+    return aioredis.Redis.from_url(url)
+
+
+def build_memo_key(namespace: str, args: Any) -> str:
+    """
+    Build a Redis key from a namespace and JSON-serializable arguments.
+
+    Args:
+        namespace: Key prefix, typically "<server>:<tool>"
+        args: Arguments identifying the call (normalized with sorted keys)
+
+    Returns:
+        Key of the form "<namespace>:<blake2b hex digest>"
+    """
+    normalized = json.dumps(args, sort_keys=True, default=str).encode()
+    return f"{namespace}:{hashlib.blake2b(normalized, digest_size=16).hexdigest()}"
+
+
+def _is_cacheable(result: Any) -> bool:
+    """Default filter: never memoize structured error responses."""
+    return not (isinstance(result, dict) and "error" in result)
+
+
+def _dumps(value: Any) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(value)
+    return json.dumps(value).encode()
+
+
+def _loads(data: bytes) -> Any:
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def async_memoize(
+    namespace: str,
+    ttl: int,
+    client: Optional[Any] = None,
+    key_func: Optional[Callable[..., Any]] = None,
+    cache_if: Callable[[Any], bool] = _is_cacheable,
+) -> Callable[[Callable[..., Awaitable[T]]], Callable[..., Awaitable[T]]]:
+    """
+    Memoize an async function's JSON-serializable results in Redis.
+
+    Exceptions raised by the function are never cached, and Redis failures
+    are logged and bypassed rather than surfaced to the caller.
+
+    Args:
+        namespace: Key prefix, typically "<server>:<tool>"
+        ttl: Time to live for memoized results, in seconds
+        client: Async Redis client (default: get_redis_client(), resolved per call)
+        key_func: Maps the call's (*args, **kwargs) to the value that is hashed
+            into the key (default: positional and keyword arguments)
+        cache_if: Predicate deciding whether a result is stored
+            (default: skip dicts carrying an "error" key)
+
+    Returns:
+        Decorator for async functions
+    """
+
+    def decorator(func: Callable[..., Awaitable[T]]) -> Callable[..., Awaitable[T]]:
+        @functools.wraps(func)
+        async def wrapper(*args: Any, **kwargs: Any) -> T:
+            redis_client = client if client is not None else get_redis_client()
+            if redis_client is None:
+                return await func(*args, **kwargs)
+
+            key_args = key_func(*args, **kwargs) if key_func else [args, kwargs]
+            key = build_memo_key(namespace, key_args)
+
+            try:
+                cached = await redis_client.get(key)
+            except Exception as e:
+                logger.warning(f"Redis GET failed for {namespace}: {e}")
+                cached = None
+            if cached is not None:
+                return _loads(cached)
+
+            result = await func(*args, **kwargs)
+            if cache_if(result):
+                try:
+                    await redis_client.setex(key, ttl, _dumps(result))
+                except Exception as e:
+                    logger.warning(f"Redis SETEX failed for {namespace}: {e}")
+            return result
+
+        return wrapper
+
+    return decorator
+
+
+async def memo_get_many(keys: List[str], client: Optional[Any] = None) -> List[Any]:
+    """
+    Fetch several memoized values in one round-trip (Redis MGET).
+
+    Args:
+        keys: Keys built with build_memo_key
+        client: Async Redis client (default: get_redis_client())
+
+    Returns:
+        One value per key, in order; None for misses, and all None when Redis
+        is not configured or the MGET fails
+    """
+    redis_client = client if client is not None else get_redis_client()
+    if redis_client is None or not keys:
+        return [None] * len(keys)
+    try:
+        values = await redis_client.mget(keys)
+    except Exception as e:
+        logger.warning(f"Redis MGET failed: {e}")
+        return [None] * len(keys)
+    return [None if value is None else _loads(value) for value in values]
+
+
+async def memo_set_many(items: Dict[str, Any], ttl: int, client: Optional[Any] = None) -> None:
+    """
+    Store several JSON-serializable values in one pipelined round-trip.
+
+    Args:
+        items: Mapping of key (built with build_memo_key) to value
+        ttl: Time to live for each value, in seconds
+        client: Async Redis client (default: get_redis_client())
+    """
+    redis_client = client if client is not None else get_redis_client()
+    if redis_client is None or not items:
+        return
+    try:
+        async with redis_client.pipeline(transaction=False) as pipe:
+            for key, value in items.items():
+                pipe.setex(key, ttl, _dumps(value))
+            await pipe.execute()
+    except Exception as e:
+        logger.warning(f"Redis pipelined SETEX failed: {e}")
@@ -15,6 +15,7 @@ Access is provided through S&P Global Market Intelligence API.
 """
 
 import asyncio
+import functools
 import json
 import os
 import sys
@@ -71,7 +72,6 @@ from sp_global_client import SPGlobalClient
 # Initialize configuration and client
 _config: Optional[SPGlobalConfig] = None
 _config_error_payload: Optional[Dict[str, Any]] = None
-_client: Optional[SPGlobalClient] = None
 
 
 def get_config() -> SPGlobalConfig:
@@ -82,15 +82,17 @@ def get_config() -> SPGlobalConfig:
     return _config
 
 
+@functools.lru_cache(maxsize=1)
 def get_client() -> SPGlobalClient:
     """
     Get or create S&P Global API client.
     
+    The client is built once and memoized; failures are not cached, so a
+    misconfigured service keeps raising until the configuration is fixed.
+    
     Raises:
         McpError: If configuration is invalid (SERVICE_NOT_CONFIGURED)
     """
-    global _client, _config_error_payload
-    
     # Check for configuration errors first
     if _config_error_payload:
         error = McpError(
@@ -102,29 +104,27 @@ def get_client() -> SPGlobalClient:
             raise error
         raise ValueError("Service configuration is incomplete or invalid.")
     
-    if _client is None:
-        config = get_config()
-        # Use config's API key
-        if not config.sp_global_api_key:
-            error = McpError(
-                code=ErrorCode.SERVICE_NOT_CONFIGURED,
-                message="SP_GLOBAL_API_KEY is required for this service. The service cannot function without this key.",
-                details=[{
-                    "field": "SP_GLOBAL_API_KEY",
-                    "message": "SP_GLOBAL_API_KEY is required. Contact S&P Global Market Intelligence support for API access.",
-                    "critical": True
-                }]
-            ) if ERROR_HANDLING_AVAILABLE and ErrorCode else None
-            if error:
-                raise error
-            raise ValueError(
-                "SP_GLOBAL_API_KEY environment variable is required. "
-                "The service cannot function without this key. "
-                "Please set SP_GLOBAL_API_KEY in your environment or configuration. "
-                "Contact S&P Global Market Intelligence support for API access."
-            )
-        _client = SPGlobalClient(api_key=config.sp_global_api_key)
-    return _client
+    config = get_config()
+    # Use config's API key
+    if not config.sp_global_api_key:
+        error = McpError(
+            code=ErrorCode.SERVICE_NOT_CONFIGURED,
+            message="SP_GLOBAL_API_KEY is required for this service. The service cannot function without this key.",
+            details=[{
+                "field": "SP_GLOBAL_API_KEY",
+                "message": "SP_GLOBAL_API_KEY is required. Contact S&P Global Market Intelligence support for API access.",
+                "critical": True
+            }]
+        ) if ERROR_HANDLING_AVAILABLE and ErrorCode else None
+        if error:
+            raise error
+        raise ValueError(
+            "SP_GLOBAL_API_KEY environment variable is required. "
+            "The service cannot function without this key. "
+            "Please set SP_GLOBAL_API_KEY in your environment or configuration. "
+            "Contact S&P Global Market Intelligence support for API access."
+        )
+    return SPGlobalClient(api_key=config.sp_global_api_key)
 
 
 # Tool implementations
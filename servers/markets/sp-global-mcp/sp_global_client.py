@@ -13,20 +13,60 @@ For official API documentation and access:
 - GitHub: Available through S&P Global Market Intelligence (contact for access)
 """
 
+import functools
 import os
 import sys
 from pathlib import Path
 from typing import Any, Dict, List, Optional
 from datetime import datetime
 
-# Add project root to path for common modules
-sys.path.insert(0, str(Path(__file__).parent.parent.parent.parent))
+try:
+    import requests
+except ImportError:
+    requests = None  # type: ignore
+
+try:
+    import orjson
+except ImportError:
+    orjson = None  # type: ignore
+
+# Add project root to path for common modules (once: server.py and this module
+# both do this, and duplicate entries lengthen every later import lookup)
+_PROJECT_ROOT = str(Path(__file__).parent.parent.parent.parent)
+if _PROJECT_ROOT not in sys.path:
+    sys.path.insert(0, _PROJECT_ROOT)
 
 from common.http import get, post, CallOptions, call_upstream
 from common.errors import ApiError, map_upstream_error
 from common.cache import get_cache, build_cache_key
 
 
+# API endpoint paths, relative to the base URL (no leading slash)
+_EP_SEARCH = "companies/search"
+_EP_FUNDAMENTALS = "companies/{company_id}/fundamentals"
+_EP_TRANSCRIPTS = "companies/{company_id}/transcripts"
+_EP_PROFILE = "companies/{company_id}/profile"
+
+# Stub response templates. Per-call fields are None placeholders so that
+# `{**template, ...}` keeps the key order; empty sequences are tuples so a
+# caller can't mutate the shared template.
+_STUB_NOTE = "This is a stub implementation. Replace with actual S&P Global API integration."
+_STUB_SEARCH = {"count": 0, "companies": (), "query": None, "note": _STUB_NOTE}
+_STUB_FUNDAMENTALS = {"company_id": None, "period_type": None, "fundamentals": None, "note": _STUB_NOTE}
+_STUB_TRANSCRIPTS = {"company_id": None, "transcripts": (), "count": 0, "note": _STUB_NOTE}
+_STUB_PROFILE = {"company_id": None, "profile": None, "note": _STUB_NOTE}
+
+
+@functools.lru_cache(maxsize=4096)
+def _profile_cache_key(company_id: str) -> str:
+    """Build (and memoize) the cache key for a company profile lookup."""
+    return build_cache_key(
+        server_name="sp-global-mcp",
+        tool_name="get_company_profile",
+        args={"company_id": company_id}
+    )
+
+
 class SPGlobalClient:
     """
     Client for S&P Global Market Intelligence API.
@@ -40,6 +80,15 @@ class SPGlobalClient:
     based on your subscription and API documentation.
     """
     
+    # Headers shared by every instance; only Authorization varies per client
+    _STATIC_HEADERS = (
+        ("Content-Type", "application/json"),
+        ("Accept", "application/json"),
+    )
+    
+    # HTTP method -> request helper; methods are expected upper-case
+    _DISPATCH = {"GET": "_do_get", "POST": "_do_post"}
+    
     def __init__(
         self,
         api_key: Optional[str] = None,
@@ -66,12 +115,53 @@ class SPGlobalClient:
             "SP_GLOBAL_API_URL",
             "https://api.spglobal.com/marketintelligence/v1"
         )
+        # Precomputed URL prefix so requests only need a single concatenation
+        self._base = self.base_url.rstrip("/") + "/"
         
-        self.headers = {
-            "Authorization": f"Bearer {self.api_key}",
-            "Content-Type": "application/json",
-            "Accept": "application/json"
-        }
+        self.headers = dict(self._STATIC_HEADERS, Authorization=f"Bearer {self.api_key}")
+        
+        # Persistent session so repeated calls reuse the same keep-alive connection
+        # instead of paying a TCP+TLS handshake per request
+        self.session = requests.Session() if requests is not None else None
+        if self.session is not None:
+            self.session.headers.update(self.headers)
+    
+    def _do_get(
+        self,
+        url: str,
+        params: Optional[Dict[str, Any]],
+        data: Optional[Dict[str, Any]]
+    ):
+        """Send a GET request (retried, idempotent) through common.http."""
+        return get(
+            url=url,
+            upstream="sp_global",
+            timeout=10.0,
+            headers=self.headers,
+            params=params,
+            allow_retries=True,
+            session=self.session
+        )
+    
+    def _do_post(
+        self,
+        url: str,
+        params: Optional[Dict[str, Any]],
+        data: Optional[Dict[str, Any]]
+    ):
+        """Send a POST request (never retried) through common.http."""
+        options = CallOptions(
+            method="POST",
+            url=url,
+            upstream="sp_global",
+            timeout=10.0,
+            headers=self.headers,
+            params=params,
+            json=data,
+            allow_retries=False,  # POST is not idempotent
+            session=self.session
+        )
+        return call_upstream(options)
     
     def _make_request(
         self,
@@ -84,8 +174,8 @@ class SPGlobalClient:
         Make HTTP request to S&P Global API using common HTTP wrapper.
         
         Args:
-            endpoint: API endpoint path
-            method: HTTP method (GET, POST, etc.)
+            endpoint: API endpoint path (relative to base URL)
+            method: HTTP method ("GET" or "POST", upper-case)
             params: Query parameters
             data: Request body data
         
@@ -95,37 +185,16 @@ class SPGlobalClient:
         Raises:
             ApiError: For API errors (handled by common/http wrapper)
         """
-        url = f"{self.base_url}/{endpoint.lstrip('/')}"
+        url = self._base + endpoint[1:] if endpoint.startswith("/") else self._base + endpoint
         
-        try:
-            if method.upper() == "GET":
-                response = get(
-                    url=url,
-                    upstream="sp_global",
-                    timeout=10.0,
-                    headers=self.headers,
-                    params=params,
-                    allow_retries=True
-                )
-            elif method.upper() == "POST":
-                options = CallOptions(
-                    method="POST",
-                    url=url,
-                    upstream="sp_global",
-                    timeout=10.0,
-                    headers=self.headers,
-                    params=params,
-                    json=data,
-                    allow_retries=False  # POST is not idempotent
-                )
-                response = call_upstream(options)
-            else:
-                raise ValueError(f"Unsupported HTTP method: {method}")
-            
-            return response.json()
+        handler = self._DISPATCH.get(method)
+        if handler is None:
+            raise ValueError(f"Unsupported HTTP method: {method}")
         
-        except ApiError as e:
-            # Re-raise ApiError as-is (already standardized)
+        try:
+            response = getattr(self, handler)(url, params, data)
+        except ApiError:
+            # Re-raise ApiError as-is (common.http maps transport and HTTP failures)
             raise
         except Exception as e:
             # Map unexpected errors to structured errors
@@ -136,6 +205,17 @@ class SPGlobalClient:
                 message=f"S&P Global API request failed: {str(e)}",
                 original_error=e
             )
+        
+        try:
+            # orjson parses the raw bytes directly, skipping requests' encoding detection
+            if orjson is not None:
+                return orjson.loads(response.content)
+            return response.json()
+        except ValueError as e:
+            raise ApiError(
+                message=f"S&P Global API returned invalid JSON: {str(e)}",
+                original_error=e
+            )
     
     def search_companies(
         self,
@@ -158,25 +238,16 @@ class SPGlobalClient:
         """
         params = {
             "q": query,
-            "limit": min(limit, 100)  # Cap at 100
+            "limit": min(limit, 100),  # Cap at 100
+            **{k: v for k, v in (("country", country), ("sector", sector)) if v}
         }
         
-        if country:
-            params["country"] = country
-        if sector:
-            params["sector"] = sector
-        
         # TODO: Replace with actual S&P Global API endpoint
         # Example endpoint structure (verify with S&P Global documentation):
-        # response = self._make_request("/companies/search", params=params)
+        # response = self._make_request(_EP_SEARCH, params=params)
         
         # Stub implementation - replace with actual API call
-        return {
-            "count": 0,
-            "companies": [],
-            "query": query,
-            "note": "This is a stub implementation. Replace with actual S&P Global API integration."
-        }
+        return {**_STUB_SEARCH, "query": query}
     
     def get_fundamentals(
         self,
@@ -200,27 +271,20 @@ class SPGlobalClient:
             Dictionary with fundamentals data
         """
         params = {
-            "periodType": period_type
+            "periodType": period_type,
+            **{k: v for k, v in (
+                ("startDate", start_date),
+                ("endDate", end_date),
+                ("metrics", ",".join(metrics) if metrics else None)
+            ) if v}
         }
         
-        if start_date:
-            params["startDate"] = start_date
-        if end_date:
-            params["endDate"] = end_date
-        if metrics:
-            params["metrics"] = ",".join(metrics)
-        
         # TODO: Replace with actual S&P Global API endpoint
         # Example endpoint structure (verify with S&P Global documentation):
-        # response = self._make_request(f"/companies/{company_id}/fundamentals", params=params)
+        # response = self._make_request(_EP_FUNDAMENTALS.format(company_id=company_id), params=params)
         
         # Stub implementation - replace with actual API call
-        return {
-            "company_id": company_id,
-            "period_type": period_type,
-            "fundamentals": {},
-            "note": "This is a stub implementation. Replace with actual S&P Global API integration."
-        }
+        return {**_STUB_FUNDAMENTALS, "company_id": company_id, "period_type": period_type, "fundamentals": {}}
     
     def get_earnings_transcripts(
         self,
@@ -242,25 +306,16 @@ class SPGlobalClient:
             Dictionary with transcripts data
         """
         params = {
-            "limit": min(limit, 50)  # Cap at 50
+            "limit": min(limit, 50),  # Cap at 50
+            **{k: v for k, v in (("startDate", start_date), ("endDate", end_date)) if v}
         }
         
-        if start_date:
-            params["startDate"] = start_date
-        if end_date:
-            params["endDate"] = end_date
-        
         # TODO: Replace with actual S&P Global API endpoint
         # Example endpoint structure (verify with S&P Global documentation):
-        # response = self._make_request(f"/companies/{company_id}/transcripts", params=params)
+        # response = self._make_request(_EP_TRANSCRIPTS.format(company_id=company_id), params=params)
         
         # Stub implementation - replace with actual API call
-        return {
-            "company_id": company_id,
-            "transcripts": [],
-            "count": 0,
-            "note": "This is a stub implementation. Replace with actual S&P Global API integration."
-        }
+        return {**_STUB_TRANSCRIPTS, "company_id": company_id}
     
     def get_company_profile(self, company_id: str) -> Dict[str, Any]:
         """
@@ -274,25 +329,17 @@ class SPGlobalClient:
         """
         # Check cache first (24 hour TTL for company profiles - update daily)
         cache = get_cache()
-        cache_key = build_cache_key(
-            server_name="sp-global-mcp",
-            tool_name="get_company_profile",
-            args={"company_id": company_id}
-        )
+        cache_key = _profile_cache_key(company_id)
         cached = cache.get(cache_key)
         if cached:
             return cached
         
         # TODO: Replace with actual S&P Global API endpoint
         # Example endpoint structure (verify with S&P Global documentation):
-        # response = self._make_request(f"/companies/{company_id}/profile")
+        # response = self._make_request(_EP_PROFILE.format(company_id=company_id))
         
         # Stub implementation - replace with actual API call
-        result = {
-            "company_id": company_id,
-            "profile": {},
-            "note": "This is a stub implementation. Replace with actual S&P Global API integration."
-        }
+        result = {**_STUB_PROFILE, "company_id": company_id, "profile": {}}
         
         # Cache result with 24 hour TTL (company profiles update daily)
         cache.set(cache_key, result, ttl_seconds=24 * 60 * 60)
@@ -2,6 +2,7 @@
 Unit tests for S&P Global MCP Server.
 """
 
+import asyncio
 import pytest
 from unittest.mock import Mock, patch, MagicMock
 import sys
@@ -17,8 +18,7 @@ pytestmark = [pytest.mark.unit, pytest.mark.python]
 class TestSPGlobalServer:
     """Test S&P Global MCP Server functionality."""
     
-    @pytest.mark.asyncio
-    async def test_sp_global_search_companies_success(self):
+    def test_sp_global_search_companies_success(self):
         """Test successful company search."""
         from server import sp_global_search_companies
         
@@ -38,13 +38,12 @@ class TestSPGlobalServer:
                 "query": "Test"
             }
             
-            result = await sp_global_search_companies(query="Test", limit=10)
+            result = asyncio.run(sp_global_search_companies(query="Test", limit=10))
             
             assert "companies" in result or "count" in result
             assert "error" not in result
     
-    @pytest.mark.asyncio
-    async def test_sp_global_search_companies_timeout(self):
+    def test_sp_global_search_companies_timeout(self):
         """Test company search with timeout error."""
         from server import sp_global_search_companies
         import requests
@@ -56,13 +55,12 @@ class TestSPGlobalServer:
             timeout_error = requests.exceptions.Timeout("Request timed out")
             mock_client.search_companies.side_effect = timeout_error
             
-            result = await sp_global_search_companies(query="Test", limit=10)
+            result = asyncio.run(sp_global_search_companies(query="Test", limit=10))
             
             # Should return error response (already using map_upstream_error)
             assert "error" in result
     
-    @pytest.mark.asyncio
-    async def test_sp_global_get_fundamentals_success(self):
+    def test_sp_global_get_fundamentals_success(self):
         """Test successful fundamentals retrieval."""
         from server import sp_global_get_fundamentals
         
@@ -78,16 +76,15 @@ class TestSPGlobalServer:
                 }
             }
             
-            result = await sp_global_get_fundamentals(
+            result = asyncio.run(sp_global_get_fundamentals(
                 company_id="12345",
                 period_type="Annual"
-            )
+            ))
             
             assert "fundamentals" in result or "company_id" in result
             assert "error" not in result
     
-    @pytest.mark.asyncio
-    async def test_sp_global_get_fundamentals_403_forbidden(self):
+    def test_sp_global_get_fundamentals_403_forbidden(self):
         """Test fundamentals retrieval with 403 Forbidden error."""
         from server import sp_global_get_fundamentals
         from common.errors import ApiError
@@ -107,10 +104,21 @@ class TestSPGlobalServer:
             )
             mock_client.get_fundamentals.side_effect = api_error
             
-            result = await sp_global_get_fundamentals(
+            result = asyncio.run(sp_global_get_fundamentals(
                 company_id="12345",
                 period_type="Annual"
-            )
+            ))
             
             # Should return error response (already using map_upstream_error)
             assert "error" in result
+    
+    def test_make_request_maps_unexpected_errors(self):
+        """Test that non-HTTP failures during a request surface as structured errors."""
+        from sp_global_client import SPGlobalClient
+        from common.errors import McpError
+        
+        client = SPGlobalClient(api_key="test-key")
+        
+        with patch("sp_global_client.get", side_effect=RuntimeError("boom")):
+            with pytest.raises(McpError):
+                client._make_request("/companies/search", params={"q": "Test"})
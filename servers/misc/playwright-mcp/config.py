@@ -11,13 +11,23 @@ from typing import List, Optional
 import sys
 from pathlib import Path
 
-# Add parent directory to path for common modules
-sys.path.insert(0, str(Path(__file__).parent.parent.parent.parent))
+# Add parent directory to path for common modules (once: server.py and this module
+# both do this, and duplicate entries lengthen every later import lookup)
+_PROJECT_ROOT = str(Path(__file__).parent.parent.parent.parent)
+if _PROJECT_ROOT not in sys.path:
+    sys.path.insert(0, _PROJECT_ROOT)
 
 from common.config import ServerConfig, ConfigIssue
 
 
-@dataclass
+_VALID_BROWSERS = frozenset({"chromium", "firefox", "webkit"})
+_URL_PREFIXES = ("http://", "https://")
+
+# dataclass(slots=True) is only available on Python 3.10+
+_DATACLASS_OPTIONS = {"slots": True} if sys.version_info >= (3, 10) else {}
+
+
+@dataclass(**_DATACLASS_OPTIONS)
 class PlaywrightServerConfig(ServerConfig):
     """
     Configuration for Playwright MCP server.
@@ -47,7 +57,7 @@ class PlaywrightServerConfig(ServerConfig):
         issues: List[ConfigIssue] = []
         
         # Validate browser type if provided
-        if self.browser_type and self.browser_type not in ["chromium", "firefox", "webkit"]:
+        if self.browser_type and self.browser_type not in _VALID_BROWSERS:
             issues.append(ConfigIssue(
                 field="browser_type",
                 message=f"Invalid browser_type '{self.browser_type}'. Must be one of: chromium, firefox, webkit",
@@ -63,12 +73,11 @@ class PlaywrightServerConfig(ServerConfig):
             ))
         
         # Validate base_url format if provided
-        if self.base_url:
-            if not (self.base_url.startswith("http://") or self.base_url.startswith("https://")):
-                issues.append(ConfigIssue(
-                    field="base_url",
-                    message="base_url must start with http:// or https://",
-                    critical=False
-                ))
+        if self.base_url and not self.base_url.startswith(_URL_PREFIXES):
+            issues.append(ConfigIssue(
+                field="base_url",
+                message="base_url must start with http:// or https://",
+                critical=False
+            ))
         
         return issues
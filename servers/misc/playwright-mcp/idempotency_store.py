@@ -5,24 +5,118 @@ Stores completed actions by idempotency key to prevent duplicate executions.
 Uses in-memory storage with optional cache integration.
 """
 
+import functools
 import hashlib
 import json
-import time
-from dataclasses import dataclass
-from typing import Any, Dict, Optional
-
 import sys
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, fields
 from pathlib import Path
+from typing import TYPE_CHECKING, Any, Callable, Dict, List, Optional, Tuple
+
+try:
+    from blake3 import blake3
+except ImportError:
+    blake3 = None  # type: ignore
+
+try:
+    import orjson
+except ImportError:
+    orjson = None  # type: ignore
+
+if TYPE_CHECKING:
+    from common.cache import Cache
+
+# Serialization options for parameter normalization, resolved once at import
+_ORJSON_KEY_OPTIONS = (orjson.OPT_SORT_KEYS | orjson.OPT_NON_STR_KEYS) if orjson is not None else 0
+
+# common.cache is imported on first use so importing this module stays cheap
+_get_cache: Optional[Callable[[], "Cache"]] = None
+
+
+def _cache_factory() -> Callable[[], "Cache"]:
+    """
+    Import common.cache on first use and return its get_cache function.
+    
+    Returns:
+        common.cache.get_cache
+    """
+    global _get_cache
+    if _get_cache is None:
+        # Add parent directory to path for common modules
+        project_root = str(Path(__file__).parent.parent.parent.parent)
+        if project_root not in sys.path:
+            sys.path.insert(0, project_root)
+        from common.cache import get_cache
+        _get_cache = get_cache
+    return _get_cache
+
+
+def _normalize(items: Tuple[Tuple[str, Any], ...]) -> bytes:
+    """Serialize (name, value) pairs to JSON bytes (nested dicts get sorted keys)."""
+    if orjson is not None:
+        try:
+            return orjson.dumps(items, option=_ORJSON_KEY_OPTIONS, default=str)
+        except TypeError:
+            # orjson.JSONEncodeError (a TypeError) covers values it cannot encode
+            # but json can, such as integers beyond 64 bits
+            pass
+    return json.dumps(items, sort_keys=True, default=str).encode()
 
-# Add parent directory to path for common modules
-sys.path.insert(0, str(Path(__file__).parent.parent.parent.parent))
 
-from common.cache import Cache, get_cache
+# Parameter values that are hashable and serialize without nesting
+_SCALAR_TYPES = frozenset((str, int, float, bool, type(None)))
+
+
+@functools.lru_cache(maxsize=4096)
+def _fingerprint(items: Tuple[Tuple[str, Any], ...], value_types: Tuple[type, ...]) -> bytes:
+    """
+    Normalize flat scalar (name, value) pairs (memoized for repeated submissions).
+    
+    Args:
+        items: (name, value) pairs sorted by name, all values scalar
+        value_types: Type of each value; only part of the memo key, so that
+            equal-hashing values such as 1, 1.0 and True stay distinct
+        
+    Returns:
+        Normalized JSON bytes
+    """
+    return _normalize(items)
+
+
+@functools.lru_cache(maxsize=1024)
+def _compute_key(idempotency_key: str, tool_name: str, normalized_params: bytes) -> bytes:
+    """
+    Hash normalized parameters into a cache key (memoized for retried calls).
+    
+    Args:
+        idempotency_key: User-provided idempotency key
+        tool_name: Name of the tool
+        normalized_params: Sorted-key JSON encoding of the parameters
+        
+    Returns:
+        Cache key bytes
+    """
+    # Only 64 bits are kept (a key disambiguator, not a security boundary),
+    # so prefer the faster BLAKE3 and fall back to stdlib BLAKE2b
+    if blake3 is not None:
+        params_hash = blake3(normalized_params).digest(8)
+    else:
+        params_hash = hashlib.blake2b(normalized_params, digest_size=8).digest()
+    
+    # Build key: idempotency:tool:key:<raw 8-byte hash>
+    return b"idempotency:" + tool_name.encode() + b":" + idempotency_key.encode() + b":" + params_hash
+
 
+# dataclass(slots=True) is only available on Python 3.10+
+_RECORD_OPTIONS = {"slots": True, "frozen": True} if sys.version_info >= (3, 10) else {"frozen": True}
 
-@dataclass
+
+@dataclass(**_RECORD_OPTIONS)
 class IdempotencyRecord:
-    """Record of a completed action for idempotency checking."""
+    """Record of a completed action for idempotency checking (immutable)."""
     
     idempotency_key: str
     tool_name: str
@@ -32,6 +126,10 @@ class IdempotencyRecord:
     execution_id: str  # Unique ID for this execution
 
 
+# Field names in declaration order, used to serialize records for the cache
+_RECORD_FIELDS = tuple(f.name for f in fields(IdempotencyRecord))
+
+
 class IdempotencyStore:
     """
     Store for tracking completed actions by idempotency key.
@@ -40,71 +138,157 @@ class IdempotencyStore:
     idempotency_key is used with identical parameters.
     """
     
-    def __init__(self, cache: Optional[Cache] = None, ttl_seconds: int = 86400 * 7):
+    __slots__ = (
+        "_cache",
+        "_ttl_seconds",
+        "_max_entries",
+        "_cache_is_local",
+        "_in_memory_store",
+        "_write_lock",
+    )
+    
+    def __init__(
+        self,
+        cache: Optional["Cache"] = None,
+        ttl_seconds: int = 86400 * 7,
+        max_entries: int = 10_000
+    ):
         """
         Initialize idempotency store.
         
         Args:
             cache: Optional cache instance (uses global cache if not provided)
             ttl_seconds: Time to live for idempotency records (default: 7 days)
+            max_entries: Maximum records kept in memory; least recently used
+                records are evicted and remain available from a remote cache
+                (with an in-process cache they are forgotten)
         """
-        self._cache = cache or get_cache()
+        self._cache = cache or _cache_factory()()
         self._ttl_seconds = ttl_seconds
-        self._in_memory_store: Dict[str, IdempotencyRecord] = {}
+        self._max_entries = max_entries
+        # An in-process cache has no size bound and would only hold a second
+        # copy in the same memory, so with one the bounded in-memory tier is the
+        # only store. Remote caches back the tier and outlive evictions.
+        self._cache_is_local = getattr(self._cache, "is_local", False) is True
+        # Entries are (record, monotonic deadline): in-process expiry is immune
+        # to wall-clock jumps, while completed_at stays a Unix timestamp
+        self._in_memory_store: "OrderedDict[bytes, Tuple[IdempotencyRecord, float]]" = OrderedDict()
+        # Guards multi-step mutations of the in-memory tier. Reads stay
+        # lock-free: single dict operations are atomic under the GIL.
+        self._write_lock = threading.Lock()
     
-    def _build_key(self, idempotency_key: str, tool_name: str, parameters: Dict[str, Any]) -> str:
+    def _remember(self, key: bytes, record: IdempotencyRecord, deadline: float) -> None:
+        """Insert or refresh a record in the in-memory LRU, evicting the oldest."""
+        with self._write_lock:
+            self._in_memory_store[key] = (record, deadline)
+            self._in_memory_store.move_to_end(key)
+            while len(self._in_memory_store) > self._max_entries:
+                self._in_memory_store.popitem(last=False)
+    
+    def compute_key(self, idempotency_key: str, tool_name: str, parameters: Dict[str, Any]) -> bytes:
         """
         Build a cache key from idempotency key, tool name, and parameters.
         
+        Callers that both check and record the same action can compute the
+        key once and pass it to get() and store().
+        
         Args:
             idempotency_key: User-provided idempotency key
             tool_name: Name of the tool
             parameters: Tool parameters (normalized)
             
         Returns:
-            Cache key string
+            Cache key bytes
+        """
+        return self.compute_key_from_items(
+            idempotency_key, tool_name, tuple(sorted(parameters.items()))
+        )
+    
+    def compute_key_from_items(
+        self,
+        idempotency_key: str,
+        tool_name: str,
+        items: Tuple[Tuple[str, Any], ...]
+    ) -> bytes:
         """
-        # Normalize parameters by sorting keys and converting to JSON
-        normalized_params = json.dumps(parameters, sort_keys=True, default=str)
-        params_hash = hashlib.sha256(normalized_params.encode()).hexdigest()[:16]
+        Build a cache key from parameters given as (name, value) pairs.
+        
+        Lets callers with a fixed parameter list pass a tuple literal instead
+        of building a dict. Yields the same key as compute_key() for the
+        equivalent dict.
         
-        # Build key: idempotency:tool:key:hash
-        return f"idempotency:{tool_name}:{idempotency_key}:{params_hash}"
+        Args:
+            idempotency_key: User-provided idempotency key
+            tool_name: Name of the tool
+            items: (name, value) pairs sorted by name
+            
+        Returns:
+            Cache key bytes
+        """
+        # Nothing to disambiguate: the idempotency key alone identifies the action
+        if not items:
+            return b"idempotency:" + tool_name.encode() + b":" + idempotency_key.encode()
+        
+        value_types = tuple(type(value) for _, value in items)
+        if _SCALAR_TYPES.issuperset(value_types):
+            normalized_params = _fingerprint(items, value_types)
+        else:
+            # Unhashable values (e.g. form data dicts) are serialized every time
+            normalized_params = _normalize(items)
+        return _compute_key(idempotency_key, tool_name, normalized_params)
     
-    def get(self, idempotency_key: str, tool_name: str, parameters: Dict[str, Any]) -> Optional[IdempotencyRecord]:
+    def get(
+        self,
+        idempotency_key: str,
+        tool_name: str,
+        parameters: Optional[Dict[str, Any]],
+        key: Optional[bytes] = None
+    ) -> Optional[IdempotencyRecord]:
         """
         Get a previously completed action by idempotency key.
         
         Args:
             idempotency_key: User-provided idempotency key
             tool_name: Name of the tool
-            parameters: Tool parameters
+            parameters: Tool parameters (may be None when key is given)
+            key: Precomputed key from compute_key() (computed if not provided)
             
         Returns:
             IdempotencyRecord if found, None otherwise
         """
-        key = self._build_key(idempotency_key, tool_name, parameters)
+        if key is None:
+            key = self.compute_key(idempotency_key, tool_name, parameters)
         
         # Check in-memory store first
-        if key in self._in_memory_store:
-            record = self._in_memory_store[key]
-            # Check if expired
-            if time.time() < (record.completed_at + self._ttl_seconds):
+        entry = self._in_memory_store.get(key)
+        if entry is not None:
+            record, deadline = entry
+            if time.monotonic() < deadline:
+                try:
+                    self._in_memory_store.move_to_end(key)
+                except KeyError:
+                    pass  # Evicted by a concurrent write; still a valid hit
                 return record
-            else:
-                # Remove expired record
-                del self._in_memory_store[key]
+            # Remove expired record
+            with self._write_lock:
+                self._in_memory_store.pop(key, None)
+        
+        # With an in-process cache the in-memory tier is the only store
+        if self._cache_is_local:
+            return None
         
-        # Check cache
+        # Check cache (records persist completed_at as wall-clock time)
+        now = time.time()
         cached = self._cache.get(key)
         if cached:
             try:
                 # Reconstruct record from cached data
                 record = IdempotencyRecord(**cached)
                 # Check if expired
-                if time.time() < (record.completed_at + self._ttl_seconds):
+                remaining = record.completed_at + self._ttl_seconds - now
+                if remaining > 0:
                     # Store in memory for faster access
-                    self._in_memory_store[key] = record
+                    self._remember(key, record, time.monotonic() + remaining)
                     return record
             except (TypeError, KeyError):
                 # Invalid cached data, ignore
@@ -112,7 +296,47 @@ class IdempotencyStore:
         
         return None
     
-    def store(self, idempotency_key: str, tool_name: str, parameters: Dict[str, Any], result: Dict[str, Any], execution_id: str) -> None:
+    def get_many(
+        self,
+        requests: List[Tuple[str, str, Dict[str, Any]]]
+    ) -> List[Optional[IdempotencyRecord]]:
+        """
+        Look up several previously completed actions at once.
+        
+        Args:
+            requests: (idempotency_key, tool_name, parameters) tuples
+            
+        Returns:
+            One IdempotencyRecord or None per request, in the same order
+        """
+        now = time.monotonic()
+        memory = self._in_memory_store
+        results: List[Optional[IdempotencyRecord]] = []
+        
+        for idempotency_key, tool_name, parameters in requests:
+            key = self.compute_key(idempotency_key, tool_name, parameters)
+            entry = memory.get(key)
+            if entry is not None and now < entry[1]:
+                try:
+                    memory.move_to_end(key)
+                except KeyError:
+                    pass  # Evicted by a concurrent write; still a valid hit
+                results.append(entry[0])
+            else:
+                # Miss or expired in memory: fall back to the full lookup
+                results.append(self.get(idempotency_key, tool_name, parameters, key=key))
+        
+        return results
+    
+    def store(
+        self,
+        idempotency_key: str,
+        tool_name: str,
+        parameters: Dict[str, Any],
+        result: Dict[str, Any],
+        execution_id: str,
+        key: Optional[bytes] = None
+    ) -> None:
         """
         Store a completed action for idempotency checking.
         
@@ -122,8 +346,10 @@ class IdempotencyStore:
             parameters: Tool parameters
             result: Result of the action
             execution_id: Unique ID for this execution
+            key: Precomputed key from compute_key() (computed if not provided)
         """
-        key = self._build_key(idempotency_key, tool_name, parameters)
+        if key is None:
+            key = self.compute_key(idempotency_key, tool_name, parameters)
         
         record = IdempotencyRecord(
             idempotency_key=idempotency_key,
@@ -135,22 +361,19 @@ class IdempotencyStore:
         )
         
         # Store in memory
-        self._in_memory_store[key] = record
-        
-        # Store in cache (convert dataclass to dict for caching)
-        record_dict = {
-            "idempotency_key": record.idempotency_key,
-            "tool_name": record.tool_name,
-            "parameters": record.parameters,
-            "result": record.result,
-            "completed_at": record.completed_at,
-            "execution_id": record.execution_id
-        }
+        self._remember(key, record, time.monotonic() + self._ttl_seconds)
+        if self._cache_is_local:
+            return
+        
+        # Store in cache (convert dataclass to dict for caching). asdict() is
+        # avoided because it deep-copies parameters and result.
+        record_dict = {name: getattr(record, name) for name in _RECORD_FIELDS}
         self._cache.set(key, record_dict, ttl_seconds=self._ttl_seconds)
     
     def clear(self) -> None:
         """Clear all idempotency records."""
-        self._in_memory_store.clear()
+        with self._write_lock:
+            self._in_memory_store.clear()
         # Note: Cache clearing would require cache implementation support
 
 
@@ -10,13 +10,19 @@ Provides safe, guarded tools for form submission and data updates with:
 """
 
 import asyncio
+import functools
 import json
 import os
+import secrets
 import sys
-import uuid
 from pathlib import Path
 from typing import Any, Dict, List, Optional
 
+try:
+    import orjson
+except ImportError:
+    orjson = None  # type: ignore
+
 # Add parent directory to path for schema loading and common modules
 sys.path.insert(0, str(Path(__file__).parent.parent.parent.parent))
 # Add current directory to path for local imports
@@ -53,17 +59,33 @@ _config: Optional[PlaywrightServerConfig] = None
 _config_error_payload: Optional[Dict[str, Any]] = None
 _browser: Optional[Browser] = None
 _browser_context: Optional[BrowserContext] = None
-_idempotency_store: Optional[IdempotencyStore] = None
+# Shared store, created once at import so tool calls skip a lazy-init check
+_idempotency_store: IdempotencyStore = get_idempotency_store()
 
 # Required confirmation phrase for non-dry-run operations
 REQUIRED_CONFIRMATION_PHRASE = "I_understand_this_updates_real_data"
 
+# Indented tool responses are for human debugging only; compact by default
+_PRETTY_JSON = os.getenv("PLAYWRIGHT_PRETTY_JSON", "false").lower() == "true"
+
+
+def _dumps(obj: Any) -> str:
+    """Serialize a tool response (compact unless PLAYWRIGHT_PRETTY_JSON=true)."""
+    if _PRETTY_JSON:
+        return json.dumps(obj, indent=2)
+    if orjson is not None:
+        return orjson.dumps(obj).decode()
+    return json.dumps(obj, separators=(",", ":"))
+
 
+@functools.lru_cache(maxsize=16)
 def load_schema(schema_path: str) -> Dict[str, Any]:
-    """Load JSON schema from file."""
+    """Load JSON schema from file (cached; treat the result as read-only)."""
     schema_file = Path(__file__).parent.parent.parent.parent / schema_path
     if not schema_file.exists():
         raise FileNotFoundError(f"Schema file not found: {schema_file}")
+    if orjson is not None:
+        return orjson.loads(schema_file.read_bytes())
     with open(schema_file, 'r') as f:
         return json.load(f)
 
@@ -128,22 +150,20 @@ async def submit_regulatory_form(
     Returns:
         Result dictionary with status and details
     """
-    global _idempotency_store
-    
-    if _idempotency_store is None:
-        _idempotency_store = get_idempotency_store()
-    
-    # Normalize parameters for idempotency check
-    parameters = {
-        "url": url,
-        "form_data": form_data or {},
-        "submit_button_selector": submit_button_selector,
-        "wait_for_selector": wait_for_selector,
-        "timeout": timeout
-    }
+    # Normalize parameters for idempotency check (sorted by name; a dict is
+    # only built if the completed action is stored)
+    param_items = (
+        ("form_data", form_data or {}),
+        ("submit_button_selector", submit_button_selector),
+        ("timeout", timeout),
+        ("url", url),
+        ("wait_for_selector", wait_for_selector),
+    )
     
     # Check idempotency
-    existing_record = _idempotency_store.get(idempotency_key, "submit_regulatory_form", parameters)
+    # Key is computed once and reused when the completed action is stored
+    store_key = _idempotency_store.compute_key_from_items(idempotency_key, "submit_regulatory_form", param_items)
+    existing_record = _idempotency_store.get(idempotency_key, "submit_regulatory_form", None, key=store_key)
     if existing_record:
         logger.info(f"Idempotency hit for key: {idempotency_key}")
         return {
@@ -163,8 +183,8 @@ async def submit_regulatory_form(
                 field="confirm"
             )
     
-    # Generate execution ID
-    execution_id = str(uuid.uuid4())
+    # Generate execution ID (128 random bits; only needed once past the idempotency check)
+    execution_id = secrets.token_hex(16)
     
     try:
         context = await get_browser_context()
@@ -256,9 +276,10 @@ async def submit_regulatory_form(
                 _idempotency_store.store(
                     idempotency_key=idempotency_key,
                     tool_name="submit_regulatory_form",
-                    parameters=parameters,
+                    parameters=dict(param_items),
                     result=result,
-                    execution_id=execution_id
+                    execution_id=execution_id,
+                    key=store_key
                 )
             
             return result
@@ -306,22 +327,20 @@ async def update_tracker_sheet(
     Returns:
         Result dictionary with status and details
     """
-    global _idempotency_store
-    
-    if _idempotency_store is None:
-        _idempotency_store = get_idempotency_store()
-    
-    # Normalize parameters for idempotency check
-    parameters = {
-        "url": url,
-        "row_data": row_data or {},
-        "row_selector": row_selector,
-        "action": action,
-        "timeout": timeout
-    }
+    # Normalize parameters for idempotency check (sorted by name; a dict is
+    # only built if the completed action is stored)
+    param_items = (
+        ("action", action),
+        ("row_data", row_data or {}),
+        ("row_selector", row_selector),
+        ("timeout", timeout),
+        ("url", url),
+    )
     
     # Check idempotency
-    existing_record = _idempotency_store.get(idempotency_key, "update_tracker_sheet", parameters)
+    # Key is computed once and reused when the completed action is stored
+    store_key = _idempotency_store.compute_key_from_items(idempotency_key, "update_tracker_sheet", param_items)
+    existing_record = _idempotency_store.get(idempotency_key, "update_tracker_sheet", None, key=store_key)
     if existing_record:
         logger.info(f"Idempotency hit for key: {idempotency_key}")
         return {
@@ -341,8 +360,8 @@ async def update_tracker_sheet(
                 field="confirm"
             )
     
-    # Generate execution ID
-    execution_id = str(uuid.uuid4())
+    # Generate execution ID (128 random bits; only needed once past the idempotency check)
+    execution_id = secrets.token_hex(16)
     
     try:
         context = await get_browser_context()
@@ -392,9 +411,10 @@ async def update_tracker_sheet(
                 _idempotency_store.store(
                     idempotency_key=idempotency_key,
                     tool_name="update_tracker_sheet",
-                    parameters=parameters,
+                    parameters=dict(param_items),
                     result=result,
-                    execution_id=execution_id
+                    execution_id=execution_id,
+                    key=store_key
                 )
             
             return result
@@ -490,7 +510,7 @@ def create_server(fail_fast: bool = True) -> Server:
         if _config_error_payload:
             return [TextContent(
                 type="text",
-                text=json.dumps(_config_error_payload, indent=2)
+                text=_dumps(_config_error_payload)
             )]
         
         try:
@@ -509,23 +529,23 @@ def create_server(fail_fast: bool = True) -> Server:
             
             return [TextContent(
                 type="text",
-                text=json.dumps(result, indent=2)
+                text=_dumps(result)
             )]
         except McpError as e:
             return [TextContent(
                 type="text",
-                text=json.dumps({"error": e.to_dict()}, indent=2)
+                text=_dumps({"error": e.to_dict()})
             )]
         except Exception as e:
             logger.exception(f"Error in tool {name}")
             return [TextContent(
                 type="text",
-                text=json.dumps({
+                text=_dumps({
                     "error": {
                         "code": ErrorCode.INTERNAL_ERROR.value,
                         "message": str(e)
                     }
-                }, indent=2)
+                })
             )]
     
     return server
@@ -0,0 +1,166 @@
+"""
+Tests for the Playwright MCP idempotency store.
+
+Kept apart from the write-tool tests so collection does not import the server
+or build browser mocks, and xdist can schedule these independently.
+"""
+
+import pytest
+
+import sys
+from pathlib import Path
+
+# Add project root (for common modules) and server directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent.parent.parent.parent))
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from idempotency_store import IdempotencyStore
+from common.cache import Cache, get_cache
+
+
+@pytest.fixture(scope="class")
+def store_cache():
+    """In-process cache shared by the store lookup cases."""
+    return Cache()
+
+
+@pytest.fixture(scope="class")
+def shared_store(store_cache):
+    """One store reused across the store lookup cases."""
+    return IdempotencyStore(cache=store_cache)
+
+
+@pytest.fixture
+def store(shared_store, store_cache):
+    """The shared store, emptied before each case."""
+    shared_store.clear()
+    store_cache.clear()
+    return shared_store
+
+
+class TestIdempotencyStore:
+    """Test the idempotency store directly."""
+    
+    @pytest.mark.parametrize("store_key, store_params, query_key, query_params, expect_hit", [
+        pytest.param("test-key", {"param1": "value1"}, "test-key", {"param1": "value1"}, True,
+                     id="same-key-and-params"),
+        pytest.param("test-key", {"param1": "value1"}, "test-key", {"param1": "value2"}, False,
+                     id="different-params"),
+        pytest.param("test-key-1", {"param1": "value1"}, "test-key-2", {"param1": "value1"}, False,
+                     id="different-key"),
+        pytest.param("empty-key", {}, "empty-key", {}, True,
+                     id="empty-params"),
+        pytest.param("empty-key", {}, "empty-key", {"param1": "value1"}, False,
+                     id="empty-vs-nonempty-params"),
+    ])
+    def test_store_lookup(self, store, store_key, store_params, query_key, query_params, expect_hit):
+        """Test that a record is found only for the same key and parameters."""
+        tool = "test_tool"
+        result = {"success": True}
+        
+        store.store(store_key, tool, store_params, result, "exec-123")
+        record = store.get(query_key, tool, query_params)
+        
+        if not expect_hit:
+            assert record is None
+            return
+        
+        assert record is not None
+        assert record.idempotency_key == store_key
+        assert record.tool_name == tool
+        assert record.result == result
+        assert record.execution_id == "exec-123"
+    
+    def test_in_memory_store_is_bounded(self):
+        """Test that the in-memory tier evicts old records but the cache still serves them."""
+        class RemoteCache(Cache):
+            is_local = False
+        
+        store = IdempotencyStore(cache=RemoteCache(), max_entries=2)
+        tool = "test_tool"
+        params = {"param1": "value1"}
+        
+        for i in range(3):
+            store.store(f"key-{i}", tool, params, {"success": True}, f"exec-{i}")
+        
+        assert len(store._in_memory_store) == 2
+        
+        # Oldest record was evicted from memory but is still found via the cache
+        record = store.get("key-0", tool, params)
+        assert record is not None
+        assert record.execution_id == "exec-0"
+    
+    def test_precomputed_key_matches_computed_key(self):
+        """Test that a key from compute_key() finds records stored without one."""
+        store = IdempotencyStore()
+        params = {"param1": "value1"}
+        
+        store.store("test-key", "test_tool", params, {"success": True}, "exec-123")
+        key = store.compute_key("test-key", "test_tool", params)
+        
+        record = store.get("test-key", "test_tool", params, key=key)
+        assert record is not None
+        assert record.execution_id == "exec-123"
+    
+    def test_get_many_preserves_order(self):
+        """Test batched lookups return one result per request, in order."""
+        store = IdempotencyStore()
+        params = {"param1": "value1"}
+        
+        store.store("key-a", "test_tool", params, {"success": True}, "exec-a")
+        store.store("key-b", "test_tool", params, {"success": True}, "exec-b")
+        
+        records = store.get_many([
+            ("key-b", "test_tool", params),
+            ("key-missing", "test_tool", params),
+            ("key-a", "test_tool", params),
+        ])
+        
+        assert [r.execution_id if r else None for r in records] == ["exec-b", None, "exec-a"]
+    
+    def test_local_cache_keeps_bounded_in_memory_tier(self):
+        """Test that with the default in-process cache records stay in the bounded tier only."""
+        cache = get_cache()
+        cache_size = cache.size()
+        store = IdempotencyStore(max_entries=2)
+        tool = "test_tool"
+        params = {"param1": "value1"}
+        
+        for i in range(3):
+            store.store(f"key-{i}", tool, params, {"success": True}, f"exec-{i}")
+        
+        assert len(store._in_memory_store) == 2
+        assert cache.size() == cache_size
+        assert store.get("key-0", tool, params) is None
+        record = store.get("key-2", tool, params)
+        assert record is not None
+        assert record.execution_id == "exec-2"
+    
+    def test_compute_key_from_items_matches_dict_key(self):
+        """Test that sorted (name, value) pairs yield the same key as the dict."""
+        store = IdempotencyStore()
+        params = {"url": "https://example.com", "form_data": {"b": "2", "a": "1"}, "timeout": 5000}
+        items = tuple(sorted(params.items()))
+        
+        assert store.compute_key_from_items("test-key", "test_tool", items) == \
+            store.compute_key("test-key", "test_tool", params)
+    
+    def test_scalar_keys_distinguish_equal_hashing_values(self):
+        """Test that memoized scalar parameters keep 1, 1.0 and True apart."""
+        store = IdempotencyStore(cache=Cache())
+        keys = {
+            store.compute_key("test-key", "test_tool", {"timeout": value})
+            for value in (1, 1.0, True)
+        }
+        
+        assert len(keys) == 3
+        assert store.compute_key("test-key", "test_tool", {"timeout": 1}) in keys
+    
+    def test_compute_key_accepts_integers_beyond_64_bits(self):
+        """Test that values orjson cannot encode fall back to json."""
+        store = IdempotencyStore(cache=Cache())
+        
+        key = store.compute_key("test-key", "test_tool", {"n": 2 ** 70})
+        
+        assert key == store.compute_key("test-key", "test_tool", {"n": 2 ** 70})
+        assert key != store.compute_key("test-key", "test_tool", {"n": 2 ** 70 + 1})
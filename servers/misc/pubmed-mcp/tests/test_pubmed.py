@@ -18,6 +18,7 @@ sys.path.insert(0, str(Path(__file__).parent.parent.parent.parent.parent))
 pytestmark = [pytest.mark.unit, pytest.mark.typescript]
 
 
+@pytest.mark.skip(reason="Placeholders for the TypeScript implementation; run `npm test` instead")
 class TestPubMedServer:
     """Test PubMed MCP Server functionality."""
     
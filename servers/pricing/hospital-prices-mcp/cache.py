@@ -4,137 +4,268 @@ Caching layer for Turquoise Health API responses.
 Uses SQLite to cache API responses for 24 hours to reduce API calls and costs.
 """
 
+import atexit
 import sqlite3
 import json
 import hashlib
-from datetime import datetime, timedelta
+import queue
+import sys
+import threading
+import time
+from collections import OrderedDict
 from pathlib import Path
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, Tuple
+
+try:
+    import orjson
+except ImportError:
+    orjson = None  # type: ignore
+
+
+# Write-behind batching: flush after this many queued sets or this long after the first
+_WRITE_BATCH_SIZE = 64
+_WRITE_BATCH_SECONDS = 0.05
+
+# Expired rows are purged opportunistically once every this many get() calls
+_CLEANUP_EVERY_GETS = 1000
+
+_INSERT_SQL = """
+    INSERT OR REPLACE INTO cache (key, value, created_at, expires_at)
+    VALUES (?, ?, ?, ?)
+"""
 
 
 class Cache:
     """Simple SQLite-based cache for API responses."""
-    
-    def __init__(self, cache_file: Optional[str] = None, ttl_hours: int = 24):
+
+    def __init__(self, cache_file: Optional[str] = None, ttl_hours: int = 24, memory_size: int = 1024):
         """
         Initialize cache.
-        
+
         Args:
             cache_file: Path to SQLite cache file (default: cache.db in server directory)
             ttl_hours: Time-to-live for cached entries in hours (default: 24)
+            memory_size: Maximum entries kept in the in-process LRU in front of SQLite
         """
         if cache_file is None:
             cache_file = str(Path(__file__).parent / "cache.db")
-        
+
         self.cache_file = cache_file
         self.ttl_hours = ttl_hours
+        self.memory_size = memory_size
+
+        # Hot keys are served from memory: key -> (expires_at, serialized value).
+        # Values are kept serialized so every hit decodes a fresh copy, as SQLite does
+        self._mem: "OrderedDict[str, Tuple[int, str]]" = OrderedDict()
+        self._get_count = 0
+
+        # One long-lived connection per cache, shared across threads under a lock,
+        # so the SQLite page cache stays warm between calls
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(cache_file, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute("PRAGMA temp_store=MEMORY")
+        self._conn.execute("PRAGMA mmap_size=134217728")
         self._init_db()
-    
+
+        # set() only enqueues rows; a background thread writes them in batches.
+        # Queued rows stay visible to get() through the in-memory tier.
+        self._write_queue: "queue.Queue[Optional[Tuple[str, str, int, int]]]" = queue.Queue()
+        self._writer = threading.Thread(target=self._write_loop, name="hospital-cache-writer", daemon=True)
+        self._writer.start()
+        self._closed = False
+
+        # The writer is a daemon thread, so drain queued sets before the interpreter exits
+        atexit.register(self.close)
+
     def _init_db(self):
         """Initialize SQLite database and create cache table if needed."""
-        conn = sqlite3.connect(self.cache_file)
-        cursor = conn.cursor()
-        cursor.execute("""
-            CREATE TABLE IF NOT EXISTS cache (
-                key TEXT PRIMARY KEY,
-                value TEXT NOT NULL,
-                created_at TIMESTAMP NOT NULL,
-                expires_at TIMESTAMP NOT NULL
-            )
-        """)
-        cursor.execute("""
-            CREATE INDEX IF NOT EXISTS idx_expires_at ON cache(expires_at)
-        """)
-        conn.commit()
-        conn.close()
-    
+        with self._lock:
+            # Timestamps were once stored as ISO-8601 text; entries are
+            # disposable, so rebuild the table rather than convert them
+            columns = {
+                name: col_type
+                for _, name, col_type, *_ in self._conn.execute("PRAGMA table_info(cache)")
+            }
+            if columns and columns.get("expires_at", "").upper() != "INTEGER":
+                self._conn.execute("DROP TABLE cache")
+
+            self._conn.execute("""
+                CREATE TABLE IF NOT EXISTS cache (
+                    key TEXT PRIMARY KEY,
+                    value TEXT NOT NULL,
+                    created_at INTEGER NOT NULL,
+                    expires_at INTEGER NOT NULL
+                )
+            """)
+            self._conn.execute("""
+                CREATE INDEX IF NOT EXISTS idx_expires_at ON cache(expires_at)
+            """)
+
     def _make_key(self, endpoint: str, params: Dict[str, Any]) -> str:
         """Generate cache key from endpoint and parameters."""
         key_data = {
             "endpoint": endpoint,
             "params": params
         }
-        key_str = json.dumps(key_data, sort_keys=True)
-        return hashlib.sha256(key_str.encode()).hexdigest()
-    
+        if orjson is not None:
+            key_bytes = orjson.dumps(key_data, option=orjson.OPT_SORT_KEYS)
+        else:
+            key_bytes = json.dumps(key_data, sort_keys=True).encode()
+        # A 128-bit BLAKE2b digest is plenty for a local cache key and cheaper than SHA-256
+        return hashlib.blake2b(key_bytes, digest_size=16).hexdigest()
+
+    def _remember(self, key: str, expires_at: int, value_str: str):
+        """Insert an entry into the in-memory LRU, evicting the oldest. Caller holds the lock."""
+        self._mem[key] = (expires_at, value_str)
+        self._mem.move_to_end(key)
+        while len(self._mem) > self.memory_size:
+            self._mem.popitem(last=False)
+
     def get(self, endpoint: str, params: Dict[str, Any]) -> Optional[Dict[str, Any]]:
         """
         Get cached response if available and not expired.
-        
+
         Args:
             endpoint: API endpoint path
             params: Request parameters
-        
+
         Returns:
             Cached response dictionary or None if not found/expired
         """
+        self._get_count += 1
+        if self._get_count % _CLEANUP_EVERY_GETS == 0:
+            self.purge()
+
         key = self._make_key(endpoint, params)
-        
-        conn = sqlite3.connect(self.cache_file)
-        cursor = conn.cursor()
-        
-        cursor.execute("""
-            SELECT value, expires_at FROM cache
-            WHERE key = ? AND expires_at > ?
-        """, (key, datetime.now().isoformat()))
-        
-        row = cursor.fetchone()
-        conn.close()
-        
-        if row:
-            value_str, expires_at = row
-            return json.loads(value_str)
-        
+        now = int(time.time())
+
+        with self._lock:
+            entry = self._mem.get(key)
+            if entry is not None:
+                if entry[0] > now:
+                    self._mem.move_to_end(key)
+                    return json.loads(entry[1])
+                del self._mem[key]
+
+            row = self._conn.execute("""
+                SELECT value, expires_at FROM cache
+                WHERE key = ? AND expires_at > ?
+            """, (key, now)).fetchone()
+
+            if row:
+                value_str, expires_at = row
+                self._remember(key, expires_at, value_str)
+                return json.loads(value_str)
+
         return None
-    
+
     def set(self, endpoint: str, params: Dict[str, Any], value: Dict[str, Any]):
         """
         Cache a response.
-        
+
         Args:
             endpoint: API endpoint path
             params: Request parameters
             value: Response value to cache
+
+        Raises:
+            RuntimeError: If the cache has been closed
         """
         key = self._make_key(endpoint, params)
         value_str = json.dumps(value)
-        created_at = datetime.now()
-        expires_at = created_at + timedelta(hours=self.ttl_hours)
-        
-        conn = sqlite3.connect(self.cache_file)
-        cursor = conn.cursor()
-        
-        cursor.execute("""
-            INSERT OR REPLACE INTO cache (key, value, created_at, expires_at)
-            VALUES (?, ?, ?, ?)
-        """, (key, value_str, created_at.isoformat(), expires_at.isoformat()))
-        
-        conn.commit()
-        conn.close()
-    
+        created_at = int(time.time())
+        expires_at = created_at + self.ttl_hours * 3600
+
+        with self._lock:
+            if self._closed:
+                raise RuntimeError("Cache is closed")
+            self._remember(key, expires_at, value_str)
+            # Enqueued under the lock so no row can land behind close()'s sentinel
+            self._write_queue.put((key, value_str, created_at, expires_at))
+
+    def _write_loop(self):
+        """Drain queued sets into SQLite, one transaction per batch."""
+        stopping = False
+        while not stopping:
+            row = self._write_queue.get()
+            if row is None:
+                self._write_queue.task_done()
+                return
+
+            rows = [row]
+            deadline = time.monotonic() + _WRITE_BATCH_SECONDS
+            while len(rows) < _WRITE_BATCH_SIZE:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    row = self._write_queue.get(timeout=remaining)
+                except queue.Empty:
+                    break
+                if row is None:
+                    stopping = True
+                    break
+                rows.append(row)
+
+            try:
+                with self._lock:
+                    self._conn.execute("BEGIN")
+                    try:
+                        self._conn.executemany(_INSERT_SQL, rows)
+                        self._conn.execute("COMMIT")
+                    except sqlite3.Error:
+                        self._conn.execute("ROLLBACK")
+                        raise
+            except sqlite3.Error as e:
+                print(f"Warning: Failed to write {len(rows)} cache entries: {e}", file=sys.stderr)
+            finally:
+                for _ in range(len(rows) + stopping):
+                    self._write_queue.task_done()
+
+    def flush(self):
+        """Block until every queued set has been written to SQLite."""
+        self._write_queue.join()
+
+    def purge(self, expired_only: bool = True) -> int:
+        """
+        Delete cache entries in a single statement.
+
+        Args:
+            expired_only: Only remove expired entries (default: True); False clears everything
+
+        Returns:
+            Number of rows deleted from SQLite
+        """
+        self.flush()
+        with self._lock:
+            if expired_only:
+                now = int(time.time())
+                for key in [key for key, (expires_at, _) in self._mem.items() if expires_at <= now]:
+                    del self._mem[key]
+                cursor = self._conn.execute("DELETE FROM cache WHERE expires_at <= ?", (now,))
+            else:
+                self._mem.clear()
+                cursor = self._conn.execute("DELETE FROM cache")
+            return cursor.rowcount
+
     def clear_expired(self):
         """Remove expired cache entries."""
-        conn = sqlite3.connect(self.cache_file)
-        cursor = conn.cursor()
-        
-        cursor.execute("DELETE FROM cache WHERE expires_at <= ?", (datetime.now().isoformat(),))
-        
-        deleted = cursor.rowcount
-        conn.commit()
-        conn.close()
-        
-        return deleted
-    
+        return self.purge(expired_only=True)
+
     def clear_all(self):
         """Clear all cache entries."""
-        conn = sqlite3.connect(self.cache_file)
-        cursor = conn.cursor()
-        
-        cursor.execute("DELETE FROM cache")
-        
-        deleted = cursor.rowcount
-        conn.commit()
-        conn.close()
-        
-        return deleted
+        return self.purge(expired_only=False)
 
+    def close(self):
+        """Write pending sets, stop the writer thread and close the SQLite connection (idempotent)."""
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+            self._write_queue.put(None)
+        self._writer.join()
+        with self._lock:
+            self._conn.close()
+        atexit.unregister(self.close)
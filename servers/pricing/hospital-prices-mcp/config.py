@@ -5,6 +5,7 @@ This module defines the server configuration, including validation of required
 and optional environment variables.
 """
 
+import functools
 import os
 import sys
 from dataclasses import dataclass
@@ -16,8 +17,49 @@ sys.path.insert(0, str(Path(__file__).parent.parent.parent.parent))
 
 from common.config import ServerConfig, ConfigIssue
 
+# Validation rules as (predicate, field, message, critical), checked in order
+_RULES = (
+    # API key is required for this service to function
+    (
+        lambda c: not c.turquoise_api_key,
+        "TURQUOISE_API_KEY",
+        "TURQUOISE_API_KEY is required for this service. The service cannot function without this key.",
+        True,
+    ),
+    (
+        lambda c: bool(c.turquoise_api_key) and len(c.turquoise_api_key.strip()) < 10,
+        "TURQUOISE_API_KEY",
+        "TURQUOISE_API_KEY appears to be invalid (too short)",
+        True,
+    ),
+    # Validate base URL if provided
+    (
+        lambda c: bool(c.turquoise_base_url) and not c.turquoise_base_url.startswith(("http://", "https://")),
+        "TURQUOISE_BASE_URL",
+        "TURQUOISE_BASE_URL must start with http:// or https://",
+        False,
+    ),
+    # Validate cache TTL if provided
+    (
+        lambda c: c.cache_ttl_hours is not None and c.cache_ttl_hours < 1,
+        "CACHE_TTL_HOURS",
+        "CACHE_TTL_HOURS must be at least 1 hour",
+        False,
+    ),
+    (
+        lambda c: c.cache_ttl_hours is not None and c.cache_ttl_hours > 8760,  # 1 year
+        "CACHE_TTL_HOURS",
+        "CACHE_TTL_HOURS is very large (>1 year), consider a shorter TTL",
+        False,
+    ),
+)
 
-@dataclass
+
+# Config is read-only once loaded; dataclass(slots=True) is only available on Python 3.10+
+_DATACLASS_OPTIONS = {"frozen": True, "slots": True} if sys.version_info >= (3, 10) else {"frozen": True}
+
+
+@dataclass(**_DATACLASS_OPTIONS)
 class HospitalPricesConfig(ServerConfig):
     """
     Configuration for hospital-prices-mcp server.
@@ -44,59 +86,29 @@ class HospitalPricesConfig(ServerConfig):
         Returns:
             List of ConfigIssue objects. Empty list means configuration is valid.
         """
-        issues: List[ConfigIssue] = []
-        
-        # API key is required for this service to function
-        if not self.turquoise_api_key:
-            issues.append(ConfigIssue(
-                field="TURQUOISE_API_KEY",
-                message="TURQUOISE_API_KEY is required for this service. The service cannot function without this key.",
-                critical=True
-            ))
-        elif len(self.turquoise_api_key.strip()) < 10:
-            issues.append(ConfigIssue(
-                field="TURQUOISE_API_KEY",
-                message="TURQUOISE_API_KEY appears to be invalid (too short)",
-                critical=True
-            ))
-        
-        # Validate base URL if provided
-        if self.turquoise_base_url:
-            if not self.turquoise_base_url.startswith(("http://", "https://")):
-                issues.append(ConfigIssue(
-                    field="TURQUOISE_BASE_URL",
-                    message="TURQUOISE_BASE_URL must start with http:// or https://",
-                    critical=False
-                ))
-        
-        # Validate cache TTL if provided
-        if self.cache_ttl_hours is not None:
-            if self.cache_ttl_hours < 1:
-                issues.append(ConfigIssue(
-                    field="CACHE_TTL_HOURS",
-                    message="CACHE_TTL_HOURS must be at least 1 hour",
-                    critical=False
-                ))
-            elif self.cache_ttl_hours > 8760:  # 1 year
-                issues.append(ConfigIssue(
-                    field="CACHE_TTL_HOURS",
-                    message="CACHE_TTL_HOURS is very large (>1 year), consider a shorter TTL",
-                    critical=False
-                ))
-        
-        return issues
+        return [
+            ConfigIssue(field=field, message=message, critical=critical)
+            for predicate, field, message, critical in _RULES
+            if predicate(self)
+        ]
 
 
+@functools.lru_cache(maxsize=1)
 def load_config() -> HospitalPricesConfig:
     """
     Load configuration from environment variables.
     
+    The environment is read once per process; call load_config.cache_clear()
+    to pick up changes (e.g. in tests).
+    
     Returns:
         HospitalPricesConfig instance
     """
+    env = os.environ
+    cache_ttl_hours = env.get("CACHE_TTL_HOURS")
     return HospitalPricesConfig(
-        turquoise_api_key=os.getenv("TURQUOISE_API_KEY"),
-        turquoise_base_url=os.getenv("TURQUOISE_BASE_URL"),
-        cache_ttl_hours=int(os.getenv("CACHE_TTL_HOURS", "24")) if os.getenv("CACHE_TTL_HOURS") else None,
-        strict_output_validation=os.getenv("MCP_STRICT_OUTPUT_VALIDATION", "false").lower() in ("true", "1", "yes", "on")
+        turquoise_api_key=env.get("TURQUOISE_API_KEY"),
+        turquoise_base_url=env.get("TURQUOISE_BASE_URL"),
+        cache_ttl_hours=int(cache_ttl_hours) if cache_ttl_hours else None,
+        strict_output_validation=env.get("MCP_STRICT_OUTPUT_VALIDATION", "false").lower() in ("true", "1", "yes", "on")
     )
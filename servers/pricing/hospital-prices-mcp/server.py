@@ -7,11 +7,15 @@ Provides tools for searching, comparing, and estimating hospital procedure price
 """
 
 import asyncio
+import concurrent.futures
+import functools
 import json
 import os
 import sys
+import time
+from collections import OrderedDict
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Any, Callable, Dict, List, Optional, Set, Tuple
 
 # Add parent directory to path for schema loading and common modules
 sys.path.insert(0, str(Path(__file__).parent.parent.parent.parent))
@@ -20,6 +24,13 @@ sys.path.insert(0, str(Path(__file__).parent))
 from turquoise_client import TurquoiseHealthClient
 from config import load_config, HospitalPricesConfig
 from common.config import validate_config_or_raise, ConfigValidationError
+from common.redis_memo import (
+    async_memoize,
+    build_memo_key,
+    get_redis_client,
+    memo_get_many,
+    memo_set_many,
+)
 
 # Import DCAP for tool discovery (https://github.com/boorich/dcap)
 from common.dcap import (
@@ -29,24 +40,42 @@ from common.dcap import (
     DCAP_ENABLED,
 )
 
-# Import CMS fee schedule functions from claims-edi-mcp for macro tool
-try:
-    # Add claims-edi-mcp to path
-    claims_edi_path = Path(__file__).parent.parent.parent / "claims" / "claims-edi-mcp"
-    if claims_edi_path.exists():
-        sys.path.insert(0, str(claims_edi_path))
+# CMS fee schedule functions from claims-edi-mcp, used only by the macro tool.
+# They are imported on first use (see _load_cms_fee_schedules) to keep startup light.
+claims_edi_path = Path(__file__).parent.parent.parent / "claims" / "claims-edi-mcp"
+CMS_FEE_SCHEDULES_AVAILABLE = claims_edi_path.exists()
+lookup_cpt_price: Optional[Callable[..., Dict[str, Any]]] = None
+lookup_hcpcs_price: Optional[Callable[..., Dict[str, Any]]] = None
+if not CMS_FEE_SCHEDULES_AVAILABLE:
+    print("Warning: claims-edi-mcp not found. CMS fee schedule lookups will be unavailable.", file=sys.stderr)
+
+
+def _load_cms_fee_schedules() -> bool:
+    """
+    Import the CMS fee schedule functions on first use.
+    
+    Returns:
+        Whether CMS fee schedule lookups are available
+    """
+    global CMS_FEE_SCHEDULES_AVAILABLE, lookup_cpt_price, lookup_hcpcs_price
+    if not CMS_FEE_SCHEDULES_AVAILABLE or lookup_cpt_price is not None:
+        return CMS_FEE_SCHEDULES_AVAILABLE
+    try:
+        if str(claims_edi_path) not in sys.path:
+            sys.path.append(str(claims_edi_path))
         from cms_fee_schedules import lookup_cpt_price, lookup_hcpcs_price
-        CMS_FEE_SCHEDULES_AVAILABLE = True
-    else:
+    except ImportError as e:
         CMS_FEE_SCHEDULES_AVAILABLE = False
-        print("Warning: claims-edi-mcp not found. CMS fee schedule lookups will be unavailable.", file=sys.stderr)
-except ImportError as e:
-    CMS_FEE_SCHEDULES_AVAILABLE = False
-    print(f"Warning: Could not import CMS fee schedule functions: {e}", file=sys.stderr)
+        print(f"Warning: Could not import CMS fee schedule functions: {e}", file=sys.stderr)
+    return CMS_FEE_SCHEDULES_AVAILABLE
 
 # Import validation utilities
 try:
-    from common.validation import validate_tool_input, validate_tool_output
+    from common.validation import (
+        validate_tool_input,
+        validate_tool_output,
+        _is_strict_output_validation_enabled,
+    )
     from common.errors import ValidationError, format_error_response
     VALIDATION_AVAILABLE = True
 except ImportError:
@@ -69,6 +98,18 @@ except ImportError:
     format_error_response = None
     ErrorCode = None
 
+# Native JSON encoder for tool responses (optional - falls back to json)
+try:
+    import orjson
+except ImportError:
+    orjson = None  # type: ignore
+
+# Compiled JSON Schema validators (optional - falls back to common.validation)
+try:
+    import fastjsonschema
+except ImportError:
+    fastjsonschema = None  # type: ignore
+
 # Try to import MCP SDK - fallback to basic implementation if not available
 try:
     from mcp.server import Server
@@ -81,20 +122,126 @@ except ImportError:
     print("Warning: MCP SDK not found. Install with: pip install mcp", file=sys.stderr)
 
 
+# Repository root; schema paths are relative to it
+_BASE = Path(__file__).resolve().parent.parent.parent.parent
+
+
 # Load schemas
+@functools.lru_cache(maxsize=32)
 def load_schema(schema_path: str) -> Dict[str, Any]:
-    """Load JSON schema from file."""
-    schema_file = Path(__file__).parent.parent.parent.parent / schema_path
+    """Load JSON schema from file (cached; treat the result as read-only)."""
+    schema_file = _BASE / schema_path
     if not schema_file.exists():
         raise FileNotFoundError(f"Schema file not found: {schema_file}")
+    if orjson is not None:
+        return orjson.loads(schema_file.read_bytes())
     with open(schema_file, 'r') as f:
         return json.load(f)
 
 
+def _dumps(obj: Any) -> str:
+    """Serialize a tool response as indented JSON, using orjson when available."""
+    if orjson is not None:
+        # OPT_NON_STR_KEYS matches json.dumps, which stringifies int/float keys
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS).decode()
+    return json.dumps(obj, indent=2)
+
+
+# Input schema (under schemas/) for each tool; None means the tool has no schema
+_INPUT_SCHEMAS: Dict[str, Optional[str]] = {
+    "hospital_prices_search_procedure": "hospital_prices_search",
+    "hospital_prices_get_rates": "hospital_prices_get_rates",
+    "hospital_prices_compare": "hospital_prices_compare",
+    "hospital_prices_estimate_cash": "hospital_prices_estimate",
+    "hospital_prices_estimate_patient_out_of_pocket": None,
+    "patient_oop_estimate_macro": "patient_oop_estimate",
+}
+
+
+# Output schema for each tool, checked only in strict output validation mode
+_OUTPUT_SCHEMAS: Dict[str, Optional[str]] = {
+    "hospital_prices_search_procedure": "hospital_prices_output",
+    "hospital_prices_get_rates": "hospital_prices_get_rates_output",
+    "hospital_prices_compare": "hospital_prices_compare_output",
+    "hospital_prices_estimate_cash": "hospital_prices_estimate_output",
+    "hospital_prices_estimate_patient_out_of_pocket": None,
+    "patient_oop_estimate_macro": None,
+}
+
+
+def _compile_validators(schemas: Dict[str, Optional[str]]) -> Dict[str, Callable[[Any], Any]]:
+    """Compile each tool's schema once with fastjsonschema (empty if unavailable)."""
+    if fastjsonschema is None:
+        return {}
+    # use_default=False: validation must not write schema defaults into the
+    # arguments or results it checks (the jsonschema fallback doesn't either)
+    return {
+        tool: fastjsonschema.compile(load_schema(f"schemas/{schema_name}.json"), use_default=False)
+        for tool, schema_name in schemas.items()
+        if schema_name is not None
+    }
+
+
+_INPUT_VALIDATORS = _compile_validators(_INPUT_SCHEMAS)
+_OUTPUT_VALIDATORS = _compile_validators(_OUTPUT_SCHEMAS)
+
+
+def _validate_input(name: str, arguments: Dict[str, Any]) -> None:
+    """
+    Validate tool arguments against the tool's input schema.
+    
+    Raises:
+        ValidationError: If the arguments don't match the schema
+    """
+    schema_name = _INPUT_SCHEMAS.get(name)
+    if schema_name is None:
+        return
+    
+    validate = _INPUT_VALIDATORS.get(name)
+    if validate is None:
+        validate_tool_input(name, arguments, schema_name=schema_name)
+        return
+    
+    try:
+        validate(arguments)
+    except fastjsonschema.JsonSchemaValueException as e:
+        raise ValidationError(
+            message=f"Input validation failed for tool '{name}': {e.message}",
+            validation_errors=[{"message": e.message, "path": e.path, "validator": e.rule}],
+            details={"schema": schema_name, "tool": name},
+        ) from e
+
+
+def _validate_output(name: str, result: Dict[str, Any]) -> None:
+    """
+    Validate a tool result against the tool's output schema (strict mode only).
+    
+    Raises:
+        ValidationError: If strict output validation is enabled and the result
+            doesn't match the schema
+    """
+    schema_name = _OUTPUT_SCHEMAS.get(name)
+    if schema_name is None or not _is_strict_output_validation_enabled():
+        return
+    
+    validate = _OUTPUT_VALIDATORS.get(name)
+    if validate is None:
+        validate_tool_output(name, result, schema_name=schema_name)
+        return
+    
+    try:
+        validate(result)
+    except fastjsonschema.JsonSchemaValueException as e:
+        raise ValidationError(
+            message=f"Output validation failed for tool '{name}': {e.message}",
+            validation_errors=[{"message": e.message, "path": e.path, "validator": e.rule}],
+            details={"schema": schema_name, "tool": name},
+        ) from e
+
+
 # Initialize configuration and client
 _config: Optional[HospitalPricesConfig] = None
 _config_error_payload: Optional[Dict[str, Any]] = None
-_client: Optional[TurquoiseHealthClient] = None
 
 
 def get_config() -> HospitalPricesConfig:
@@ -105,15 +252,17 @@ def get_config() -> HospitalPricesConfig:
     return _config
 
 
+@functools.lru_cache(maxsize=None)
 def get_client() -> TurquoiseHealthClient:
     """
     Get or create Turquoise Health API client.
     
+    The client is memoized; failures are not cached, so a call after a
+    configuration error keeps raising. Use get_client.cache_clear() to reset.
+    
     Raises:
         ValueError: If TURQUOISE_API_KEY is not set (fail-closed behavior)
     """
-    global _client, _config_error_payload
-    
     # Check for configuration errors first
     if _config_error_payload:
         error = McpError(
@@ -125,17 +274,180 @@ def get_client() -> TurquoiseHealthClient:
             raise error
         raise ValueError("Service configuration is incomplete or invalid.")
     
-    if _client is None:
-        config = get_config()
-        # Use config's API key
-        if not config.turquoise_api_key:
-            raise ValueError(
-                "TURQUOISE_API_KEY environment variable is required. "
-                "The service cannot function without this key. "
-                "Please set TURQUOISE_API_KEY in your environment or configuration."
-            )
-        _client = TurquoiseHealthClient(api_key=config.turquoise_api_key)
-    return _client
+    config = get_config()
+    # Use config's API key
+    if not config.turquoise_api_key:
+        raise ValueError(
+            "TURQUOISE_API_KEY environment variable is required. "
+            "The service cannot function without this key. "
+            "Please set TURQUOISE_API_KEY in your environment or configuration."
+        )
+    return TurquoiseHealthClient(api_key=config.turquoise_api_key)
+
+
+# Short-lived cache of Turquoise responses for repeated identical tool calls.
+# Entries are shared between callers: treat cached results as read-only.
+_TOOL_CACHE_TTL = float(os.getenv("HOSPITAL_PRICES_CACHE_TTL", "300"))
+_TOOL_CACHE_MAXSIZE = 2048
+_tool_cache: "OrderedDict[Tuple[Any, ...], Tuple[float, Dict[str, Any]]]" = OrderedDict()
+_tool_cache_stats = {"hits": 0, "misses": 0}
+
+
+# Blocking Turquoise calls run on a dedicated pool sized to the API's
+# concurrency budget, so bursts of tool calls queue here instead of hitting 429s
+_IO_POOL = concurrent.futures.ThreadPoolExecutor(
+    max_workers=int(os.getenv("TURQUOISE_MAX_CONCURRENCY", "8")),
+    thread_name_prefix="turquoise-io",
+)
+
+
+async def _run_blocking(fn: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+    """Run a blocking client call on the Turquoise I/O pool (asyncio.to_thread for Python 3.8)."""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_IO_POOL, functools.partial(fn, *args, **kwargs))
+
+
+async def _fetch(key: Tuple[Any, ...], fetch: Callable[[], Dict[str, Any]]) -> Dict[str, Any]:
+    """Run a Turquoise fetch on the I/O pool (key identifies the call for Redis)."""
+    return await _run_blocking(fetch)
+
+
+# Responses are also memoized in Redis when REDIS_URL is set, so they survive
+# restarts and are shared between server processes. TTL in seconds per method.
+_REDIS_TTLS = {
+    "search_procedure_price": 60,
+    "get_hospital_rates": 24 * 60 * 60,
+    "compare_prices": 60 * 60,
+    "estimate_cash_price": 60 * 60,
+}
+_REDIS_FETCHERS = {
+    method: async_memoize(
+        f"hospital-prices-mcp:{method}", ttl, key_func=lambda key, fetch: key
+    )(_fetch)
+    for method, ttl in _REDIS_TTLS.items()
+}
+
+# CMS fee schedules are published yearly, so memoized prices are kept for a day
+_CMS_PRICE_REDIS_TTL = 24 * 60 * 60
+
+
+# Turquoise calls currently in flight, so concurrent identical calls share one
+_inflight: "Dict[Tuple[Any, ...], asyncio.Future]" = {}
+
+
+async def _cached_call(key: Tuple[Any, ...], fetch: Callable[[], Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    Return a fresh cached result for key, or run fetch and cache its result.
+    
+    The blocking fetch runs on the Turquoise I/O pool so the event loop keeps
+    serving other tool calls, and concurrent calls with the same key await
+    a single fetch instead of each hitting the API. Misses consult Redis
+    (when configured) before calling Turquoise.
+    
+    Args:
+        key: Normalized (client method, arguments...) tuple
+        fetch: Zero-argument callable performing the Turquoise API call
+    
+    Returns:
+        Client result (errors raised by fetch are not cached)
+    """
+    entry = _tool_cache.get(key)
+    if entry is not None and entry[0] > time.monotonic():
+        _tool_cache.move_to_end(key)
+        _tool_cache_stats["hits"] += 1
+        return entry[1]
+    
+    task = _inflight.get(key)
+    if task is None:
+        _tool_cache_stats["misses"] += 1
+        task = asyncio.ensure_future(_REDIS_FETCHERS[key[0]](key, fetch))
+        _inflight[key] = task
+        task.add_done_callback(functools.partial(_finish_fetch, key))
+    
+    # Shielded so a cancelled caller doesn't cancel the fetch other callers await
+    return await asyncio.shield(task)
+
+
+def _finish_fetch(key: Tuple[Any, ...], task: "asyncio.Future") -> None:
+    """Cache a completed fetch and release its in-flight slot."""
+    _inflight.pop(key, None)
+    if task.cancelled() or task.exception() is not None:
+        return
+    _tool_cache[key] = (time.monotonic() + _TOOL_CACHE_TTL, task.result())
+    _tool_cache.move_to_end(key)
+    if len(_tool_cache) > _TOOL_CACHE_MAXSIZE:
+        _tool_cache.popitem(last=False)
+
+
+def cache_info() -> Dict[str, Any]:
+    """Return hit/miss counters and occupancy of the tool result cache."""
+    return {
+        **_tool_cache_stats,
+        "size": len(_tool_cache),
+        "maxsize": _TOOL_CACHE_MAXSIZE,
+        "ttl_seconds": _TOOL_CACHE_TTL,
+    }
+
+
+def cache_clear() -> None:
+    """Drop all cached tool results and reset the counters."""
+    _tool_cache.clear()
+    _tool_cache_stats["hits"] = 0
+    _tool_cache_stats["misses"] = 0
+
+
+def _location_key(location: Optional[str], zip_code: Optional[str], state: Optional[str]) -> Tuple[Any, ...]:
+    """
+    Canonicalize location arguments for cache keys and upstream queries.
+    
+    Spellings that name the same place ("Boston, MA", " boston,ma ") and ZIP
+    codes that lost their leading zero ("2115") map to one key. Callers send
+    these same values upstream, so a cache key always describes the query
+    that produced its entry.
+    
+    Returns:
+        (zip_code, location, state), each None when not given
+    """
+    if location:
+        location = " ".join(location.replace(",", ", ").split()).replace(" ,", ",").lower()
+    if zip_code:
+        zip_code = zip_code.strip()
+        if zip_code.isdigit():
+            zip_code = zip_code.zfill(5)
+    return (zip_code or None, location or None, state.strip().upper() if state else None)
+
+
+def _code_key(code: str) -> str:
+    """Canonicalize a CPT/HCPCS code for cache keys (interned for cheap comparisons)."""
+    return sys.intern(code.strip().upper())
+
+
+# Fallback error responses used when common.errors is unavailable. The
+# templates hold only immutable values (tuples for empty lists), so they are
+# safe to share; each response copies one and adds its own fields.
+_SEARCH_ERR_TMPL: Dict[str, Any] = {"count": 0, "total": 0, "prices": ()}
+_RATES_ERR_TMPL: Dict[str, Any] = {"count": 0, "prices": ()}
+_COMPARE_ERR_TMPL: Dict[str, Any] = {"count": 0, "comparisons": ()}
+_OOP_ERR_TMPL: Dict[str, Any] = {
+    "estimated_oop_min": None,
+    "estimated_oop_max": None,
+    "assumptions": (),
+    "risk_flags": ("calculation_error",)
+}
+_MACRO_ERR_TMPL: Dict[str, Any] = {
+    "procedure_summary": (),
+    "assumptions": (),
+    "risk_flags": ("calculation_error",),
+    "line_item_estimates": (),
+    "data_sources": (),
+    "facility_id": None,
+    "insurance_type": "unknown"
+}
+
+
+def _internal_error(e: Exception) -> Dict[str, str]:
+    """Build the INTERNAL_ERROR body for a fallback error response."""
+    return {"code": "INTERNAL_ERROR", "message": str(e) or "An unexpected error occurred"}
 
 
 # Tool implementations
@@ -163,18 +475,25 @@ async def hospital_prices_search_procedure(
     """
     try:
         client = get_client()
-        result = client.search_procedure_price(
-            cpt_code=cpt_code,
-            location=location,
-            radius=radius,
-            zip_code=zip_code,
-            state=state
+        code = _code_key(cpt_code)
+        zip_key, location_key, state_key = _location_key(location, zip_code, state)
+        result = await _cached_call(
+            ("search_procedure_price", code, radius, zip_key, location_key, state_key),
+            lambda: client.search_procedure_price(
+                cpt_code=code,
+                location=location_key,
+                radius=radius,
+                zip_code=zip_key,
+                state=state_key
+            )
         )
         
-        # Apply limit if specified
-        if limit and limit > 0:
-            result["prices"] = result["prices"][:limit]
-            result["count"] = len(result["prices"])
+        # Apply limit if specified. The cached result is shared, so truncate
+        # into a copy, and only when there is something to drop
+        prices = result["prices"]
+        if limit and limit > 0 and len(prices) > limit:
+            prices = prices[:limit]
+            result = {**result, "prices": prices, "count": len(prices)}
         
         return result
     except Exception as e:
@@ -183,15 +502,7 @@ async def hospital_prices_search_procedure(
             mcp_error = map_upstream_error(e)
             return format_error_response(mcp_error)
         # Fallback for when error handling not available
-        return {
-            "error": {
-                "code": "INTERNAL_ERROR",
-                "message": str(e) or "An unexpected error occurred"
-            },
-            "count": 0,
-            "total": 0,
-            "prices": []
-        }
+        return {"error": _internal_error(e), **_SEARCH_ERR_TMPL}
 
 
 async def hospital_prices_get_rates(
@@ -210,9 +521,12 @@ async def hospital_prices_get_rates(
     """
     try:
         client = get_client()
-        result = client.get_hospital_rates(
-            hospital_id=hospital_id,
-            cpt_codes=cpt_codes
+        result = await _cached_call(
+            ("get_hospital_rates", hospital_id, tuple(map(_code_key, cpt_codes)) if cpt_codes else None),
+            lambda: client.get_hospital_rates(
+                hospital_id=hospital_id,
+                cpt_codes=cpt_codes
+            )
         )
         return result
     except Exception as e:
@@ -221,15 +535,7 @@ async def hospital_prices_get_rates(
             mcp_error = map_upstream_error(e)
             return format_error_response(mcp_error)
         # Fallback for when error handling not available
-        return {
-            "error": {
-                "code": "INTERNAL_ERROR",
-                "message": str(e) or "An unexpected error occurred"
-            },
-            "hospital_id": hospital_id,
-            "count": 0,
-            "prices": []
-        }
+        return {"error": _internal_error(e), **_RATES_ERR_TMPL, "hospital_id": hospital_id}
 
 
 async def hospital_prices_compare(
@@ -254,12 +560,17 @@ async def hospital_prices_compare(
     """
     try:
         client = get_client()
-        result = client.compare_prices(
-            cpt_code=cpt_code,
-            location=location,
-            limit=limit,
-            zip_code=zip_code,
-            state=state
+        code = _code_key(cpt_code)
+        zip_key, location_key, state_key = _location_key(location, zip_code, state)
+        result = await _cached_call(
+            ("compare_prices", code, limit, zip_key, location_key, state_key),
+            lambda: client.compare_prices(
+                cpt_code=code,
+                location=location_key,
+                limit=limit,
+                zip_code=zip_key,
+                state=state_key
+            )
         )
         return result
     except Exception as e:
@@ -268,15 +579,7 @@ async def hospital_prices_compare(
             mcp_error = map_upstream_error(e)
             return format_error_response(mcp_error)
         # Fallback for when error handling not available
-        return {
-            "error": {
-                "code": "INTERNAL_ERROR",
-                "message": str(e) or "An unexpected error occurred"
-            },
-            "procedure_code": cpt_code,
-            "count": 0,
-            "comparisons": []
-        }
+        return {"error": _internal_error(e), **_COMPARE_ERR_TMPL, "procedure_code": cpt_code}
 
 
 async def hospital_prices_estimate_cash(
@@ -299,11 +602,16 @@ async def hospital_prices_estimate_cash(
     """
     try:
         client = get_client()
-        result = client.estimate_cash_price(
-            cpt_code=cpt_code,
-            location=location,
-            zip_code=zip_code,
-            state=state
+        code = _code_key(cpt_code)
+        zip_key, location_key, state_key = _location_key(location, zip_code, state)
+        result = await _cached_call(
+            ("estimate_cash_price", code, zip_key, location_key, state_key),
+            lambda: client.estimate_cash_price(
+                cpt_code=code,
+                location=location_key,
+                zip_code=zip_key,
+                state=state_key
+            )
         )
         return result
     except Exception as e:
@@ -313,16 +621,56 @@ async def hospital_prices_estimate_cash(
             return format_error_response(mcp_error)
         # Fallback for when error handling not available
         return {
-            "error": {
-                "code": "INTERNAL_ERROR",
-                "message": str(e) or "An unexpected error occurred"
-            },
+            "error": _internal_error(e),
             "procedure_code": cpt_code,
             "location": location,
             "estimate": {}
         }
 
 
+# Insurance types priced with the plan's benefits (lower-case). The macro also
+# covers POS and government plans; other types fall back to a 20-40% estimate
+_OOP_INSURED_TYPES = frozenset({"ppo", "hmo", "epo"})
+_MACRO_INSURED_TYPES = frozenset({"ppo", "hmo", "epo", "pos", "medicare", "medicaid"})
+
+
+@functools.lru_cache(maxsize=256)
+def _insured_oop_calc(
+    copay: Optional[float],
+    remaining_deductible: float,
+    coinsurance_rate: float,
+    oop_max: float
+) -> Callable[[float], Tuple[float, float]]:
+    """
+    Build the per-line OOP calculation for one insured plan.
+    
+    The plan's copay/deductible/coinsurance branch is chosen once here, so each
+    procedure line is plain arithmetic. Cached because a session usually prices
+    many procedures against the same plan.
+    
+    Returns:
+        Function mapping a base price to (oop_min, oop_max)
+    """
+    if copay:
+        # Fixed copay
+        return lambda base_price: (copay, copay)
+    if remaining_deductible > 0:
+        # Patient pays deductible portion, then coinsurance on the remaining amount
+        def calc(base_price: float) -> Tuple[float, float]:
+            oop = (
+                min(base_price, remaining_deductible)
+                + max(0, base_price - remaining_deductible) * coinsurance_rate
+            )
+            return oop, min(oop, oop_max)
+        return calc
+    
+    # Deductible met, only coinsurance applies
+    def calc(base_price: float) -> Tuple[float, float]:
+        oop = base_price * coinsurance_rate
+        return oop, min(oop, oop_max)
+    return calc
+
+
 async def hospital_prices_estimate_patient_out_of_pocket(
     procedure_codes: List[str],
     hospital_id: str,
@@ -354,13 +702,14 @@ async def hospital_prices_estimate_patient_out_of_pocket(
         client = get_client()
         
         # Get hospital rates for the procedure codes
-        rates_result = client.get_hospital_rates(
+        rates_result = await _run_blocking(
+            client.get_hospital_rates,
             hospital_id=hospital_id,
             cpt_codes=procedure_codes
         )
         
         assumptions = []
-        risk_flags = []
+        risk_flags: Set[str] = set()
         estimated_oop_min = None
         estimated_oop_max = None
         line_item_estimates = []
@@ -368,12 +717,28 @@ async def hospital_prices_estimate_patient_out_of_pocket(
         # Process each procedure code
         prices = rates_result.get("prices", [])
         if not prices:
-            risk_flags.append("no_pricing_data_available")
+            risk_flags.add("no_pricing_data_available")
             assumptions.append("No pricing data found for the specified hospital and procedure codes")
         
         total_estimated_min = 0.0
         total_estimated_max = 0.0
         
+        # Benefit inputs are the same for every line: resolve them once
+        plan_kind = insurance_type.lower() if insurance_type else None
+        is_self_pay = plan_kind == "self-pay"
+        is_insured = plan_kind in _OOP_INSURED_TYPES
+        remaining_deductible = deductible or 0.0
+        coinsurance = coinsurance_percent or 0.0
+        coinsurance_rate = coinsurance / 100.0 if coinsurance > 0 else 0.0
+        oop_max = out_of_pocket_max or float('inf')
+        if copay:
+            benefit_assumption = f"Fixed copay: ${copay:.2f}"
+        elif remaining_deductible > 0:
+            benefit_assumption = f"Deductible: ${deductible:.2f}, Coinsurance: {coinsurance}%"
+        else:
+            benefit_assumption = f"Coinsurance: {coinsurance}%"
+        insured_calc = _insured_oop_calc(copay, remaining_deductible, coinsurance_rate, oop_max)
+        
         for price_info in prices:
             proc_code = price_info.get("procedure_code", "")
             pricing = price_info.get("pricing", {})
@@ -382,7 +747,7 @@ async def hospital_prices_estimate_patient_out_of_pocket(
             base_price = pricing.get("insurance_price") or pricing.get("cash_price")
             
             if base_price is None:
-                risk_flags.append(f"missing_price_for_{proc_code}")
+                risk_flags.add(f"missing_price_for_{proc_code}")
                 continue
             
             # Calculate OOP based on insurance type and benefits
@@ -390,45 +755,18 @@ async def hospital_prices_estimate_patient_out_of_pocket(
             line_oop_max = None
             line_assumptions = []
             
-            if insurance_type and insurance_type.lower() == "self-pay":
+            if is_self_pay:
                 # Self-pay: patient pays full cash price
                 line_oop_min = base_price
                 line_oop_max = base_price
                 line_assumptions.append("Self-pay: patient responsible for full cash price")
-            elif insurance_type and insurance_type.lower() in ("ppo", "hmo", "epo"):
+            elif is_insured:
                 # Insurance: calculate based on deductible, coinsurance, OOP max
-                remaining_deductible = deductible or 0.0
-                coinsurance = coinsurance_percent or 0.0
-                oop_max = out_of_pocket_max or float('inf')
-                
-                if copay:
-                    # Fixed copay
-                    line_oop_min = copay
-                    line_oop_max = copay
-                    line_assumptions.append(f"Fixed copay: ${copay:.2f}")
-                else:
-                    # Calculate based on deductible and coinsurance
-                    if remaining_deductible > 0:
-                        # Patient pays deductible portion
-                        deductible_portion = min(base_price, remaining_deductible)
-                        remaining_after_deductible = max(0, base_price - remaining_deductible)
-                        
-                        # Coinsurance on remaining amount
-                        coinsurance_portion = remaining_after_deductible * (coinsurance / 100.0) if coinsurance > 0 else 0
-                        
-                        line_oop_min = deductible_portion + coinsurance_portion
-                        line_oop_max = min(line_oop_min, oop_max)
-                        
-                        line_assumptions.append(f"Deductible: ${deductible:.2f}, Coinsurance: {coinsurance}%")
-                    else:
-                        # Deductible met, only coinsurance applies
-                        coinsurance_portion = base_price * (coinsurance / 100.0) if coinsurance > 0 else 0
-                        line_oop_min = coinsurance_portion
-                        line_oop_max = min(coinsurance_portion, oop_max)
-                        line_assumptions.append(f"Coinsurance: {coinsurance}%")
+                line_oop_min, line_oop_max = insured_calc(base_price)
+                line_assumptions.append(benefit_assumption)
             else:
                 # Insurance type unknown or not specified
-                risk_flags.append("benefits_unknown")
+                risk_flags.add("benefits_unknown")
                 # Conservative estimate: assume patient pays 20-40% of insurance price
                 line_oop_min = base_price * 0.20
                 line_oop_max = base_price * 0.40
@@ -452,23 +790,23 @@ async def hospital_prices_estimate_patient_out_of_pocket(
         # Add general assumptions
         if not insurance_type:
             assumptions.append("Insurance type not specified: estimates may vary significantly")
-            risk_flags.append("insurance_type_unknown")
+            risk_flags.add("insurance_type_unknown")
         
         if deductible is None and insurance_type and insurance_type.lower() != "self-pay":
             assumptions.append("Deductible not provided: estimates assume deductible already met or not applicable")
         
         if coinsurance_percent is None and insurance_type and insurance_type.lower() != "self-pay":
             assumptions.append("Coinsurance not provided: estimates may be inaccurate")
-            risk_flags.append("coinsurance_unknown")
+            risk_flags.add("coinsurance_unknown")
         
         if out_of_pocket_max is None and insurance_type and insurance_type.lower() != "self-pay":
             assumptions.append("Out-of-pocket maximum not provided: estimates may exceed actual OOP max")
-            risk_flags.append("oop_max_unknown")
+            risk_flags.add("oop_max_unknown")
         
         # Check for out-of-network risk
         # Note: This is a simplified check - real implementation would verify network status
         assumptions.append("Network status not verified: patient may be out-of-network, increasing costs")
-        risk_flags.append("out_of_network_risk")
+        risk_flags.add("out_of_network_risk")
         
         return {
             "hospital_id": hospital_id,
@@ -476,7 +814,7 @@ async def hospital_prices_estimate_patient_out_of_pocket(
             "estimated_oop_min": estimated_oop_min,
             "estimated_oop_max": estimated_oop_max,
             "assumptions": assumptions,
-            "risk_flags": list(set(risk_flags)),  # Remove duplicates
+            "risk_flags": sorted(risk_flags),
             "line_item_estimates": line_item_estimates,
             "insurance_type": insurance_type or "unknown",
             "data_source": "Turquoise Health API"
@@ -488,19 +826,93 @@ async def hospital_prices_estimate_patient_out_of_pocket(
             return format_error_response(mcp_error)
         # Fallback for when error handling not available
         return {
-            "error": {
-                "code": "INTERNAL_ERROR",
-                "message": str(e) or "An unexpected error occurred"
-            },
+            "error": _internal_error(e),
+            **_OOP_ERR_TMPL,
             "hospital_id": hospital_id,
-            "procedure_codes": procedure_codes,
-            "estimated_oop_min": None,
-            "estimated_oop_max": None,
-            "assumptions": [],
-            "risk_flags": ["calculation_error"]
+            "procedure_codes": procedure_codes
         }
 
 
+def _lookup_cms_price(
+    proc_code: str,
+    is_cpt: bool,
+    is_hcpcs: bool,
+    locality: Optional[str]
+) -> Optional[Dict[str, Any]]:
+    """Look up one procedure code in the CMS fee schedules (blocking); None for unknown code types."""
+    if is_cpt:
+        return lookup_cpt_price(
+            cpt_code=proc_code,
+            year=None,  # Use current year
+            locality=locality
+        )
+    if is_hcpcs:
+        return lookup_hcpcs_price(
+            hcpcs_code=proc_code,
+            year=None
+        )
+    return None
+
+
+async def _gather_cms_prices(
+    procedure_codes: List[str],
+    code_kinds: List[Tuple[bool, bool]],
+    locality: Optional[str]
+) -> List[Any]:
+    """
+    Look up CMS fee schedule prices for all procedure codes concurrently.
+    
+    Fee schedules are local files (downloaded on a miss), so the lookups run
+    on the default executor rather than taking Turquoise I/O pool slots. When
+    Redis is configured, found prices are memoized there: all codes are read
+    with one MGET and only the misses are looked up.
+    
+    Returns:
+        One entry per code, in order: the lookup result, None when CMS fee
+        schedules are unavailable or the code type is unknown, or the
+        exception the lookup raised
+    """
+    if not _load_cms_fee_schedules():
+        return [None] * len(procedure_codes)
+    
+    keys: List[str] = []
+    results: List[Any] = [None] * len(procedure_codes)
+    if get_redis_client() is not None:
+        keys = [
+            build_memo_key("hospital-prices-mcp:cms_price", [proc_code, locality])
+            for proc_code in procedure_codes
+        ]
+        results = await memo_get_many(keys)
+    misses = [i for i, result in enumerate(results) if result is None]
+    
+    loop = asyncio.get_running_loop()
+    looked_up = await asyncio.gather(
+        *(
+            loop.run_in_executor(
+                None,
+                functools.partial(_lookup_cms_price, procedure_codes[i], *code_kinds[i], locality)
+            )
+            for i in misses
+        ),
+        return_exceptions=True
+    )
+    for i, result in zip(misses, looked_up):
+        results[i] = result
+    
+    if keys:
+        # Only found prices are stored, so codes missing from the local fee
+        # schedules are retried once the schedules are downloaded
+        await memo_set_many(
+            {
+                keys[i]: result
+                for i, result in zip(misses, looked_up)
+                if isinstance(result, dict) and result.get("status") == "found"
+            },
+            ttl=_CMS_PRICE_REDIS_TTL
+        )
+    return results
+
+
 async def patient_oop_estimate_macro(
     procedure_codes: List[str],
     patient_demographics: Optional[Dict[str, Any]] = None,
@@ -528,8 +940,8 @@ async def patient_oop_estimate_macro(
     try:
         client = get_client()
         assumptions = []
-        risk_flags = []
-        data_sources = []
+        risk_flags: Set[str] = set()
+        data_sources: Set[str] = set()
         procedure_summary = []
         line_item_estimates = []
         
@@ -547,10 +959,10 @@ async def patient_oop_estimate_macro(
             hospital_id = facility.get("hospital_id")
             if not hospital_id and facility.get("zip_code"):
                 # Could search for hospital by location, but for now require hospital_id
-                risk_flags.append("facility_location_search_not_implemented")
+                risk_flags.add("facility_location_search_not_implemented")
         
         if not hospital_id:
-            risk_flags.append("hospital_id_missing")
+            risk_flags.add("hospital_id_missing")
             assumptions.append("Hospital identifier not provided: using geographic averages")
         
         # Get patient location for geographic context
@@ -573,80 +985,107 @@ async def patient_oop_estimate_macro(
         
         hospital_pricing_data = {}
         cms_fee_schedule_data = {}
+        cms_prices = []  # Facility (or HCPCS) price per found code, for the allowed range
+        
+        code_kinds = []
+        for proc_code in procedure_codes:
+            # Determine if CPT or HCPCS
+            is_cpt = proc_code.isdigit() and len(proc_code) == 5
+            is_hcpcs = not is_cpt and len(proc_code) == 5 and proc_code[0].isalpha()
+            code_kinds.append((is_cpt, is_hcpcs))
         
-        # Step 1: Get hospital pricing data
+        # Steps 1 and 2: Get hospital pricing data and CMS fee schedule data for
+        # all procedure codes; the sources are independent, so fetch them together
+        cms_lookup = _gather_cms_prices(procedure_codes, code_kinds, locality)
         if hospital_id:
-            try:
-                rates_result = client.get_hospital_rates(
+            rates_result, cms_results = await asyncio.gather(
+                _run_blocking(
+                    client.get_hospital_rates,
                     hospital_id=hospital_id,
                     cpt_codes=procedure_codes
-                )
+                ),
+                cms_lookup,
+                return_exceptions=True
+            )
+            # Per-code CMS failures are returned in cms_results; anything else is a bug
+            if isinstance(cms_results, BaseException):
+                raise cms_results
+            if isinstance(rates_result, BaseException) and not isinstance(rates_result, Exception):
+                raise rates_result
+            if isinstance(rates_result, Exception):
+                risk_flags.add("hospital_pricing_unavailable")
+                assumptions.append(f"Hospital pricing data unavailable: {str(rates_result)}")
+            else:
                 hospital_pricing_data = rates_result
-                data_sources.append("Turquoise Health API")
-            except Exception as e:
-                risk_flags.append("hospital_pricing_unavailable")
-                assumptions.append(f"Hospital pricing data unavailable: {str(e)}")
+                data_sources.add("Turquoise Health API")
         else:
-            risk_flags.append("hospital_pricing_skipped_no_facility")
+            cms_results = await cms_lookup
+            risk_flags.add("hospital_pricing_skipped_no_facility")
             assumptions.append("Hospital pricing skipped: no facility identifier provided")
         
-        # Step 2: Get CMS fee schedule data for each procedure code
-        for proc_code in procedure_codes:
-            # Determine if CPT or HCPCS
-            is_cpt = proc_code.isdigit() and len(proc_code) == 5
-            is_hcpcs = not is_cpt and len(proc_code) == 5 and proc_code[0].isalpha()
-            
+        # Index hospital pricing by procedure code (first entry per code wins) and
+        # collect the cash/negotiated prices for the price components, in one pass
+        hospital_prices_by_code: Dict[str, Dict[str, Any]] = {}
+        cash_prices = []
+        negotiated_prices = []
+        if hospital_pricing_data and "prices" in hospital_pricing_data:
+            for price_info in hospital_pricing_data.get("prices", []):
+                pricing = price_info.get("pricing", {})
+                hospital_prices_by_code.setdefault(price_info.get("procedure_code"), pricing)
+                if pricing.get("cash_price"):
+                    cash_prices.append(pricing["cash_price"])
+                if pricing.get("insurance_price"):
+                    negotiated_prices.append(pricing["insurance_price"])
+        
+        # Benefit inputs are the same for every line: resolve them once
+        plan_kind = insurance_type.lower() if insurance_type else None
+        is_self_pay = plan_kind == "self-pay"
+        is_insured = plan_kind in _MACRO_INSURED_TYPES
+        remaining_deductible = deductible if deductible and not deductible_met else 0.0
+        coinsurance = coinsurance_percent or 0.0
+        coinsurance_rate = coinsurance / 100.0 if coinsurance > 0 else 0.0
+        oop_max = out_of_pocket_max or float('inf')
+        if copay:
+            benefit_assumption = f"Fixed copay: ${copay:.2f}"
+        elif remaining_deductible > 0:
+            benefit_assumption = f"Deductible: ${deductible:.2f} remaining, Coinsurance: {coinsurance}%"
+        else:
+            benefit_assumption = f"Coinsurance: {coinsurance}%"
+        insured_calc = _insured_oop_calc(copay, remaining_deductible, coinsurance_rate, oop_max)
+        
+        for proc_code, (is_cpt, is_hcpcs), cms_result in zip(procedure_codes, code_kinds, cms_results):
             code_type = "CPT" if is_cpt else "HCPCS" if is_hcpcs else "UNKNOWN"
             
             cms_price_data = None
             description = ""
             
-            if CMS_FEE_SCHEDULES_AVAILABLE:
-                try:
-                    if is_cpt:
-                        cms_result = lookup_cpt_price(
-                            cpt_code=proc_code,
-                            year=None,  # Use current year
-                            locality=locality
-                        )
-                        if cms_result.get("status") == "found":
-                            cms_price_data = {
-                                "facility_price": cms_result.get("facility_price"),
-                                "non_facility_price": cms_result.get("non_facility_price"),
-                                "description": cms_result.get("description", "")
-                            }
-                            description = cms_result.get("description", "")
-                            cms_fee_schedule_data[proc_code] = cms_price_data
-                            if "CMS Fee Schedule" not in data_sources:
-                                data_sources.append("CMS Fee Schedule")
-                    elif is_hcpcs:
-                        cms_result = lookup_hcpcs_price(
-                            hcpcs_code=proc_code,
-                            year=None
-                        )
-                        if cms_result.get("status") == "found":
-                            cms_price_data = {
-                                "price": cms_result.get("price"),
-                                "description": cms_result.get("description", "")
-                            }
-                            description = cms_result.get("description", "")
-                            cms_fee_schedule_data[proc_code] = cms_price_data
-                            if "CMS Fee Schedule" not in data_sources:
-                                data_sources.append("CMS Fee Schedule")
-                except Exception as e:
-                    risk_flags.append(f"cms_lookup_failed_{proc_code}")
-                    assumptions.append(f"CMS fee schedule lookup failed for {proc_code}: {str(e)}")
+            if isinstance(cms_result, Exception):
+                risk_flags.add(f"cms_lookup_failed_{proc_code}")
+                assumptions.append(f"CMS fee schedule lookup failed for {proc_code}: {str(cms_result)}")
+            elif cms_result and cms_result.get("status") == "found":
+                if is_cpt:
+                    cms_price_data = {
+                        "facility_price": cms_result.get("facility_price"),
+                        "non_facility_price": cms_result.get("non_facility_price"),
+                        "description": cms_result.get("description", "")
+                    }
+                else:
+                    cms_price_data = {
+                        "price": cms_result.get("price"),
+                        "description": cms_result.get("description", "")
+                    }
+                description = cms_result.get("description", "")
+                cms_fee_schedule_data[proc_code] = cms_price_data
+                cms_price = cms_price_data.get("facility_price") or cms_price_data.get("price")
+                if cms_price:
+                    cms_prices.append(cms_price)
+                data_sources.add("CMS Fee Schedule")
             
             if not cms_price_data:
-                risk_flags.append(f"cms_data_missing_{proc_code}")
+                risk_flags.add(f"cms_data_missing_{proc_code}")
             
             # Step 3: Get hospital pricing for this procedure
-            hospital_price_data = None
-            if hospital_pricing_data and "prices" in hospital_pricing_data:
-                for price_info in hospital_pricing_data.get("prices", []):
-                    if price_info.get("procedure_code") == proc_code:
-                        hospital_price_data = price_info.get("pricing", {})
-                        break
+            hospital_price_data = hospital_prices_by_code.get(proc_code)
             
             # Step 4: Determine base price (prefer hospital negotiated rate, fallback to CMS)
             base_price = None
@@ -668,7 +1107,7 @@ async def patient_oop_estimate_macro(
                     price_source = "cms_fee_schedule"
             
             if not base_price:
-                risk_flags.append(f"no_pricing_data_{proc_code}")
+                risk_flags.add(f"no_pricing_data_{proc_code}")
                 assumptions.append(f"No pricing data available for procedure {proc_code}")
                 continue
             
@@ -678,50 +1117,21 @@ async def patient_oop_estimate_macro(
             line_oop_likely = None
             line_assumptions = []
             
-            if insurance_type and insurance_type.lower() == "self-pay":
+            if is_self_pay:
                 # Self-pay: patient pays full cash price
                 cash_price = hospital_price_data.get("cash_price") if hospital_price_data else base_price
                 line_oop_min = cash_price
                 line_oop_max = cash_price
                 line_oop_likely = cash_price
                 line_assumptions.append("Self-pay: patient responsible for full cash price")
-            elif insurance_type and insurance_type.lower() in ("ppo", "hmo", "epo", "pos", "medicare", "medicaid"):
+            elif is_insured:
                 # Insurance: calculate based on deductible, coinsurance, OOP max
-                remaining_deductible = deductible if deductible and not deductible_met else 0.0
-                coinsurance = coinsurance_percent or 0.0
-                oop_max = out_of_pocket_max or float('inf')
-                
-                if copay:
-                    # Fixed copay
-                    line_oop_min = copay
-                    line_oop_max = copay
-                    line_oop_likely = copay
-                    line_assumptions.append(f"Fixed copay: ${copay:.2f}")
-                else:
-                    # Calculate based on deductible and coinsurance
-                    if remaining_deductible > 0:
-                        # Patient pays deductible portion
-                        deductible_portion = min(base_price, remaining_deductible)
-                        remaining_after_deductible = max(0, base_price - remaining_deductible)
-                        
-                        # Coinsurance on remaining amount
-                        coinsurance_portion = remaining_after_deductible * (coinsurance / 100.0) if coinsurance > 0 else 0
-                        
-                        line_oop_min = deductible_portion + coinsurance_portion
-                        line_oop_max = min(line_oop_min, oop_max)
-                        line_oop_likely = line_oop_min  # For deductible phase, min = likely
-                        
-                        line_assumptions.append(f"Deductible: ${deductible:.2f} remaining, Coinsurance: {coinsurance}%")
-                    else:
-                        # Deductible met, only coinsurance applies
-                        coinsurance_portion = base_price * (coinsurance / 100.0) if coinsurance > 0 else 0
-                        line_oop_min = coinsurance_portion
-                        line_oop_max = min(coinsurance_portion, oop_max)
-                        line_oop_likely = coinsurance_portion
-                        line_assumptions.append(f"Coinsurance: {coinsurance}%")
+                line_oop_min, line_oop_max = insured_calc(base_price)
+                line_oop_likely = line_oop_min
+                line_assumptions.append(benefit_assumption)
             else:
                 # Insurance type unknown or not specified
-                risk_flags.append("benefits_unknown")
+                risk_flags.add("benefits_unknown")
                 # Conservative estimate: assume patient pays 20-40% of insurance price
                 line_oop_min = base_price * 0.20
                 line_oop_max = base_price * 0.40
@@ -756,22 +1166,12 @@ async def patient_oop_estimate_macro(
         hospital_negotiated_min = None
         hospital_negotiated_max = None
         
-        if hospital_pricing_data and "prices" in hospital_pricing_data:
-            cash_prices = []
-            negotiated_prices = []
-            for price_info in hospital_pricing_data.get("prices", []):
-                pricing = price_info.get("pricing", {})
-                if pricing.get("cash_price"):
-                    cash_prices.append(pricing["cash_price"])
-                if pricing.get("insurance_price"):
-                    negotiated_prices.append(pricing["insurance_price"])
-            
-            if cash_prices:
-                hospital_cash_min = min(cash_prices)
-                hospital_cash_max = max(cash_prices)
-            if negotiated_prices:
-                hospital_negotiated_min = min(negotiated_prices)
-                hospital_negotiated_max = max(negotiated_prices)
+        if cash_prices:
+            hospital_cash_min = min(cash_prices)
+            hospital_cash_max = max(cash_prices)
+        if negotiated_prices:
+            hospital_negotiated_min = min(negotiated_prices)
+            hospital_negotiated_max = max(negotiated_prices)
         
         # Calculate allowed amount range (typically 80-120% of CMS fee schedule or negotiated rate)
         allowed_min = None
@@ -783,18 +1183,11 @@ async def patient_oop_estimate_macro(
             allowed_min = hospital_negotiated_min * 0.95  # 5% below min
             allowed_max = hospital_negotiated_max * 1.05   # 5% above max
             allowed_likely = (hospital_negotiated_min + hospital_negotiated_max) / 2
-        elif cms_fee_schedule_data:
+        elif cms_prices:
             # Fallback to CMS fee schedule
-            cms_prices = []
-            for proc_code in procedure_codes:
-                if proc_code in cms_fee_schedule_data:
-                    price = cms_fee_schedule_data[proc_code].get("facility_price") or cms_fee_schedule_data[proc_code].get("price")
-                    if price:
-                        cms_prices.append(price)
-            if cms_prices:
-                allowed_min = min(cms_prices) * 0.90
-                allowed_max = max(cms_prices) * 1.10
-                allowed_likely = sum(cms_prices) / len(cms_prices)
+            allowed_min = min(cms_prices) * 0.90
+            allowed_max = max(cms_prices) * 1.10
+            allowed_likely = sum(cms_prices) / len(cms_prices)
         
         # Calculate plan pay range (allowed amount - patient responsibility)
         plan_pay_min = None
@@ -809,26 +1202,26 @@ async def patient_oop_estimate_macro(
         # Add general assumptions
         if not insurance_type:
             assumptions.append("Insurance type not specified: estimates may vary significantly")
-            risk_flags.append("insurance_type_unknown")
+            risk_flags.add("insurance_type_unknown")
         
         if deductible is None and insurance_type and insurance_type.lower() != "self-pay":
             assumptions.append("Deductible not provided: estimates assume deductible already met or not applicable")
         
         if coinsurance_percent is None and insurance_type and insurance_type.lower() != "self-pay":
             assumptions.append("Coinsurance not provided: estimates may be inaccurate")
-            risk_flags.append("coinsurance_unknown")
+            risk_flags.add("coinsurance_unknown")
         
         if out_of_pocket_max is None and insurance_type and insurance_type.lower() != "self-pay":
             assumptions.append("Out-of-pocket maximum not provided: estimates may exceed actual OOP max")
-            risk_flags.append("oop_max_unknown")
+            risk_flags.add("oop_max_unknown")
         
         # Check for out-of-network risk
         assumptions.append("Network status not verified: patient may be out-of-network, increasing costs")
-        risk_flags.append("out_of_network_risk")
+        risk_flags.add("out_of_network_risk")
         
         if not data_sources:
-            data_sources.append("Limited data available")
-            risk_flags.append("insufficient_data")
+            data_sources.add("Limited data available")
+            risk_flags.add("insufficient_data")
         
         return {
             "procedure_summary": procedure_summary,
@@ -864,14 +1257,14 @@ async def patient_oop_estimate_macro(
                 }
             },
             "assumptions": assumptions,
-            "risk_flags": list(set(risk_flags)),  # Remove duplicates
+            "risk_flags": sorted(risk_flags),
             "line_item_estimates": line_item_estimates,
             "total_estimated_oop": {
                 "min": round(total_oop_min, 2) if total_oop_min > 0 else None,
                 "max": round(total_oop_max, 2) if total_oop_max > 0 else None,
                 "likely": round(total_oop_likely, 2) if total_oop_likely > 0 else None
             },
-            "data_sources": data_sources,
+            "data_sources": sorted(data_sources),
             "facility_id": hospital_id,
             "insurance_type": insurance_type or "unknown"
         }
@@ -882,20 +1275,170 @@ async def patient_oop_estimate_macro(
             return format_error_response(mcp_error)
         # Fallback for when error handling not available
         return {
-            "error": {
-                "code": "INTERNAL_ERROR",
-                "message": str(e) or "An unexpected error occurred"
-            },
-            "procedure_summary": [],
+            "error": _internal_error(e),
+            **_MACRO_ERR_TMPL,
             "price_components": {},
-            "assumptions": [],
-            "risk_flags": ["calculation_error"],
-            "line_item_estimates": [],
-            "total_estimated_oop": {"min": None, "max": None, "likely": None},
-            "data_sources": [],
-            "facility_id": None,
-            "insurance_type": "unknown"
+            "total_estimated_oop": {"min": None, "max": None, "likely": None}
+        }
+
+
+# Tool input schemas, built once and shared by every list_tools response
+_SEARCH_SCHEMA: Dict[str, Any] = {
+    "type": "object",
+    "properties": {
+        "cpt_code": {
+            "type": "string",
+            "description": "CPT or HCPCS procedure code (e.g., '99213')"
+        },
+        "location": {
+            "type": "string",
+            "description": "Location string (city, state or zip code)"
+        },
+        "radius": {
+            "type": "integer",
+            "description": "Search radius in miles (default: 25)",
+            "minimum": 1,
+            "maximum": 100
+        },
+        "zip_code": {
+            "type": "string",
+            "description": "ZIP code for location-based search"
+        },
+        "state": {
+            "type": "string",
+            "description": "US state code (2 letters)"
+        },
+        "limit": {
+            "type": "integer",
+            "description": "Maximum number of results to return",
+            "minimum": 1,
+            "maximum": 200
+        }
+    },
+    "required": ["cpt_code"]
+}
+
+_RATES_SCHEMA: Dict[str, Any] = {
+    "type": "object",
+    "properties": {
+        "hospital_id": {
+            "type": "string",
+            "description": "Turquoise Health hospital identifier"
+        },
+        "cpt_codes": {
+            "type": "array",
+            "items": {"type": "string"},
+            "description": "Optional list of CPT codes to filter rates"
+        }
+    },
+    "required": ["hospital_id"]
+}
+
+_COMPARE_SCHEMA: Dict[str, Any] = {
+    "type": "object",
+    "properties": {
+        "cpt_code": {
+            "type": "string",
+            "description": "CPT or HCPCS procedure code"
+        },
+        "location": {
+            "type": "string",
+            "description": "Location string (city, state or zip code)"
+        },
+        "limit": {
+            "type": "integer",
+            "description": "Maximum number of results to return (default: 10)",
+            "default": 10,
+            "minimum": 1,
+            "maximum": 100
+        },
+        "zip_code": {
+            "type": "string",
+            "description": "ZIP code for location-based search"
+        },
+        "state": {
+            "type": "string",
+            "description": "US state code (2 letters)"
+        }
+    },
+    "required": ["cpt_code", "location"]
+}
+
+_ESTIMATE_SCHEMA: Dict[str, Any] = {
+    "type": "object",
+    "properties": {
+        "cpt_code": {
+            "type": "string",
+            "description": "CPT or HCPCS procedure code"
+        },
+        "location": {
+            "type": "string",
+            "description": "Location string (city, state or zip code)"
+        },
+        "zip_code": {
+            "type": "string",
+            "description": "ZIP code for location-based search"
+        },
+        "state": {
+            "type": "string",
+            "description": "US state code (2 letters)"
+        }
+    },
+    "required": ["cpt_code", "location"]
+}
+
+_OOP_SCHEMA: Dict[str, Any] = {
+    "type": "object",
+    "properties": {
+        "procedure_codes": {
+            "type": "array",
+            "items": {"type": "string"},
+            "description": "List of CPT/HCPCS procedure codes"
+        },
+        "hospital_id": {
+            "type": "string",
+            "description": "Turquoise Health hospital identifier"
+        },
+        "insurance_type": {
+            "type": "string",
+            "description": "Insurance type (e.g., 'PPO', 'HMO', 'self-pay')",
+            "enum": ["PPO", "HMO", "EPO", "self-pay"]
+        },
+        "deductible": {
+            "type": "number",
+            "description": "Annual deductible amount (if applicable)",
+            "minimum": 0
+        },
+        "coinsurance_percent": {
+            "type": "number",
+            "description": "Coinsurance percentage (e.g., 20.0 for 20%)",
+            "minimum": 0,
+            "maximum": 100
+        },
+        "out_of_pocket_max": {
+            "type": "number",
+            "description": "Annual out-of-pocket maximum",
+            "minimum": 0
+        },
+        "copay": {
+            "type": "number",
+            "description": "Fixed copay amount (if applicable)",
+            "minimum": 0
         }
+    },
+    "required": ["procedure_codes", "hospital_id"]
+}
+
+
+# Tool name -> handler coroutine, used by call_tool
+_DISPATCH: Dict[str, Callable[..., Any]] = {
+    "hospital_prices_search_procedure": hospital_prices_search_procedure,
+    "hospital_prices_get_rates": hospital_prices_get_rates,
+    "hospital_prices_compare": hospital_prices_compare,
+    "hospital_prices_estimate_cash": hospital_prices_estimate_cash,
+    "hospital_prices_estimate_patient_out_of_pocket": hospital_prices_estimate_patient_out_of_pocket,
+    "patient_oop_estimate_macro": patient_oop_estimate_macro,
+}
 
 
 # MCP Server setup
@@ -903,178 +1446,45 @@ if MCP_AVAILABLE:
     # Create MCP server
     server = Server("hospital-pricing-mcp")
     
+    # Tool definitions never change, so build them once at import
+    _TOOLS: List[Tool] = [
+        Tool(
+            name="hospital_prices_search_procedure",
+            description="Search for hospital procedure prices by CPT code and location",
+            inputSchema=_SEARCH_SCHEMA
+        ),
+        Tool(
+            name="hospital_prices_get_rates",
+            description="Get hospital rate sheet for a specific hospital and optional CPT codes",
+            inputSchema=_RATES_SCHEMA
+        ),
+        Tool(
+            name="hospital_prices_compare",
+            description="Compare prices for a procedure across multiple facilities",
+            inputSchema=_COMPARE_SCHEMA
+        ),
+        Tool(
+            name="hospital_prices_estimate_cash",
+            description="Estimate cash price range for a procedure in a location",
+            inputSchema=_ESTIMATE_SCHEMA
+        ),
+        Tool(
+            name="hospital_prices_estimate_patient_out_of_pocket",
+            description="Estimate patient out-of-pocket costs for procedures at a specific hospital based on insurance benefits",
+            inputSchema=_OOP_SCHEMA
+        ),
+        Tool(
+            name="patient_oop_estimate_macro",
+            description="Macro tool: Estimate patient out-of-pocket costs using both hospital pricing and CMS fee schedule data. Combines Turquoise Health API pricing with CMS fee schedules for comprehensive OOP estimates.",
+            inputSchema=load_schema("schemas/patient_oop_estimate.json")
+        )
+    ]
+    
     # Register tools
     @server.list_tools()
     async def list_tools() -> List[Tool]:
         """List available tools."""
-        return [
-            Tool(
-                name="hospital_prices_search_procedure",
-                description="Search for hospital procedure prices by CPT code and location",
-                inputSchema={
-                    "type": "object",
-                    "properties": {
-                        "cpt_code": {
-                            "type": "string",
-                            "description": "CPT or HCPCS procedure code (e.g., '99213')"
-                        },
-                        "location": {
-                            "type": "string",
-                            "description": "Location string (city, state or zip code)"
-                        },
-                        "radius": {
-                            "type": "integer",
-                            "description": "Search radius in miles (default: 25)",
-                            "minimum": 1,
-                            "maximum": 100
-                        },
-                        "zip_code": {
-                            "type": "string",
-                            "description": "ZIP code for location-based search"
-                        },
-                        "state": {
-                            "type": "string",
-                            "description": "US state code (2 letters)"
-                        },
-                        "limit": {
-                            "type": "integer",
-                            "description": "Maximum number of results to return",
-                            "minimum": 1,
-                            "maximum": 200
-                        }
-                    },
-                    "required": ["cpt_code"]
-                }
-            ),
-            Tool(
-                name="hospital_prices_get_rates",
-                description="Get hospital rate sheet for a specific hospital and optional CPT codes",
-                inputSchema={
-                    "type": "object",
-                    "properties": {
-                        "hospital_id": {
-                            "type": "string",
-                            "description": "Turquoise Health hospital identifier"
-                        },
-                        "cpt_codes": {
-                            "type": "array",
-                            "items": {"type": "string"},
-                            "description": "Optional list of CPT codes to filter rates"
-                        }
-                    },
-                    "required": ["hospital_id"]
-                }
-            ),
-            Tool(
-                name="hospital_prices_compare",
-                description="Compare prices for a procedure across multiple facilities",
-                inputSchema={
-                    "type": "object",
-                    "properties": {
-                        "cpt_code": {
-                            "type": "string",
-                            "description": "CPT or HCPCS procedure code"
-                        },
-                        "location": {
-                            "type": "string",
-                            "description": "Location string (city, state or zip code)"
-                        },
-                        "limit": {
-                            "type": "integer",
-                            "description": "Maximum number of results to return (default: 10)",
-                            "default": 10,
-                            "minimum": 1,
-                            "maximum": 100
-                        },
-                        "zip_code": {
-                            "type": "string",
-                            "description": "ZIP code for location-based search"
-                        },
-                        "state": {
-                            "type": "string",
-                            "description": "US state code (2 letters)"
-                        }
-                    },
-                    "required": ["cpt_code", "location"]
-                }
-            ),
-            Tool(
-                name="hospital_prices_estimate_cash",
-                description="Estimate cash price range for a procedure in a location",
-                inputSchema={
-                    "type": "object",
-                    "properties": {
-                        "cpt_code": {
-                            "type": "string",
-                            "description": "CPT or HCPCS procedure code"
-                        },
-                        "location": {
-                            "type": "string",
-                            "description": "Location string (city, state or zip code)"
-                        },
-                        "zip_code": {
-                            "type": "string",
-                            "description": "ZIP code for location-based search"
-                        },
-                        "state": {
-                            "type": "string",
-                            "description": "US state code (2 letters)"
-                        }
-                    },
-                    "required": ["cpt_code", "location"]
-                }
-            ),
-            Tool(
-                name="hospital_prices_estimate_patient_out_of_pocket",
-                description="Estimate patient out-of-pocket costs for procedures at a specific hospital based on insurance benefits",
-                inputSchema={
-                    "type": "object",
-                    "properties": {
-                        "procedure_codes": {
-                            "type": "array",
-                            "items": {"type": "string"},
-                            "description": "List of CPT/HCPCS procedure codes"
-                        },
-                        "hospital_id": {
-                            "type": "string",
-                            "description": "Turquoise Health hospital identifier"
-                        },
-                        "insurance_type": {
-                            "type": "string",
-                            "description": "Insurance type (e.g., 'PPO', 'HMO', 'self-pay')",
-                            "enum": ["PPO", "HMO", "EPO", "self-pay"]
-                        },
-                        "deductible": {
-                            "type": "number",
-                            "description": "Annual deductible amount (if applicable)",
-                            "minimum": 0
-                        },
-                        "coinsurance_percent": {
-                            "type": "number",
-                            "description": "Coinsurance percentage (e.g., 20.0 for 20%)",
-                            "minimum": 0,
-                            "maximum": 100
-                        },
-                        "out_of_pocket_max": {
-                            "type": "number",
-                            "description": "Annual out-of-pocket maximum",
-                            "minimum": 0
-                        },
-                        "copay": {
-                            "type": "number",
-                            "description": "Fixed copay amount (if applicable)",
-                            "minimum": 0
-                        }
-                    },
-                    "required": ["procedure_codes", "hospital_id"]
-                }
-            ),
-            Tool(
-                name="patient_oop_estimate_macro",
-                description="Macro tool: Estimate patient out-of-pocket costs using both hospital pricing and CMS fee schedule data. Combines Turquoise Health API pricing with CMS fee schedules for comprehensive OOP estimates.",
-                inputSchema=load_schema("schemas/patient_oop_estimate.json")
-            )
-        ]
+        return _TOOLS
     
     @server.call_tool()
     async def call_tool(name: str, arguments: Dict[str, Any]) -> List[TextContent]:
@@ -1083,28 +1493,19 @@ if MCP_AVAILABLE:
             # Validate input against JSON schema
             if VALIDATION_AVAILABLE:
                 try:
-                    validate_tool_input(name, arguments)
+                    _validate_input(name, arguments)
                 except ValidationError as ve:
                     # Return properly formatted validation error
                     error_response = format_error_response(ve)
                     return [TextContent(
                         type="text",
-                        text=json.dumps(error_response, indent=2)
+                        text=_dumps(error_response)
                     )]
 
             # Execute tool
-            if name == "hospital_prices_search_procedure":
-                result = await hospital_prices_search_procedure(**arguments)
-            elif name == "hospital_prices_get_rates":
-                result = await hospital_prices_get_rates(**arguments)
-            elif name == "hospital_prices_compare":
-                result = await hospital_prices_compare(**arguments)
-            elif name == "hospital_prices_estimate_cash":
-                result = await hospital_prices_estimate_cash(**arguments)
-            elif name == "hospital_prices_estimate_patient_out_of_pocket":
-                result = await hospital_prices_estimate_patient_out_of_pocket(**arguments)
-            elif name == "patient_oop_estimate_macro":
-                result = await patient_oop_estimate_macro(**arguments)
+            handler = _DISPATCH.get(name)
+            if handler is not None:
+                result = await handler(**arguments)
             else:
                 # Unknown tool - return structured error
                 if ERROR_HANDLING_AVAILABLE and ErrorCode:
@@ -1121,7 +1522,7 @@ if MCP_AVAILABLE:
             # Validate output (only if strict mode enabled)
             if VALIDATION_AVAILABLE and isinstance(result, dict):
                 try:
-                    validate_tool_output(name, result)
+                    _validate_output(name, result)
                 except ValidationError as ve:
                     # Log output validation error but don't fail the request
                     # (output validation is for dev/test, not production)
@@ -1129,7 +1530,7 @@ if MCP_AVAILABLE:
             
             return [TextContent(
                 type="text",
-                text=json.dumps(result, indent=2)
+                text=_dumps(result)
             )]
         except ValidationError as ve:
             # Handle validation errors
@@ -1139,7 +1540,7 @@ if MCP_AVAILABLE:
                 error_response = {"error": {"code": "VALIDATION_ERROR", "message": str(ve)}}
             return [TextContent(
                 type="text",
-                text=json.dumps(error_response, indent=2)
+                text=_dumps(error_response)
             )]
         except Exception as e:
             # Catch any unexpected errors and return structured response
@@ -1155,7 +1556,7 @@ if MCP_AVAILABLE:
                 }
             return [TextContent(
                 type="text",
-                text=json.dumps(error_response, indent=2)
+                text=_dumps(error_response)
             )]
     
     # DCAP v3.1 Tool Metadata for semantic discovery
@@ -1221,73 +1622,87 @@ if MCP_AVAILABLE:
             )
             print(f"DCAP: Registered {registered} tools with relay", file=sys.stderr)
         
-        async with stdio_server() as (read_stream, write_stream):
-            await server.run(
-                read_stream,
-                write_stream,
-                server.create_initialization_options()
-            )
-    
-    if __name__ == "__main__":
-        asyncio.run(main())
-
-else:
-    # Fallback: Simple CLI interface for testing
-    async def main():
-        """Simple CLI interface for testing."""
-        import argparse
-        
-        parser = argparse.ArgumentParser(description="Hospital Pricing MCP Server (CLI Mode)")
-        parser.add_argument("--tool", required=True, choices=[
-            "search", "get_rates", "compare", "estimate"
-        ])
-        parser.add_argument("--cpt_code", help="CPT code")
-        parser.add_argument("--location", help="Location")
-        parser.add_argument("--hospital_id", help="Hospital ID")
-        parser.add_argument("--radius", type=int, help="Radius in miles")
-        parser.add_argument("--limit", type=int, default=10, help="Result limit")
-        parser.add_argument("--zip_code", help="ZIP code")
-        parser.add_argument("--state", help="State code")
-        parser.add_argument("--cpt_codes", nargs="+", help="List of CPT codes")
-        
-        args = parser.parse_args()
-        
         try:
-            if args.tool == "search":
-                result = await hospital_prices_search_procedure(
-                    cpt_code=args.cpt_code,
-                    location=args.location,
-                    radius=args.radius,
-                    zip_code=args.zip_code,
-                    state=args.state,
-                    limit=args.limit
-                )
-            elif args.tool == "get_rates":
-                result = await hospital_prices_get_rates(
-                    hospital_id=args.hospital_id,
-                    cpt_codes=args.cpt_codes
-                )
-            elif args.tool == "compare":
-                result = await hospital_prices_compare(
-                    cpt_code=args.cpt_code,
-                    location=args.location,
-                    limit=args.limit,
-                    zip_code=args.zip_code,
-                    state=args.state
+            async with stdio_server() as (read_stream, write_stream):
+                await server.run(
+                    read_stream,
+                    write_stream,
+                    server.create_initialization_options()
                 )
-            elif args.tool == "estimate":
-                result = await hospital_prices_estimate_cash(
-                    cpt_code=args.cpt_code,
-                    location=args.location,
-                    zip_code=args.zip_code,
-                    state=args.state
-                )
-            
-            print(json.dumps(result, indent=2))
-        except Exception as e:
-            print(json.dumps({"error": str(e)}, indent=2), file=sys.stderr)
-            sys.exit(1)
+        finally:
+            # Only close a client that was actually created
+            if get_client.cache_info().currsize:
+                get_client().close()
+            _IO_POOL.shutdown(wait=False)
+
+
+# Fallback: Simple CLI interface for testing
+async def _cli_main():
+    """Simple CLI interface for testing, used when the MCP SDK is not installed."""
+    args = _PARSER.parse_args()
     
-    if __name__ == "__main__":
-        asyncio.run(main())
+    try:
+        if args.tool == "search":
+            result = await hospital_prices_search_procedure(
+                cpt_code=args.cpt_code,
+                location=args.location,
+                radius=args.radius,
+                zip_code=args.zip_code,
+                state=args.state,
+                limit=args.limit
+            )
+        elif args.tool == "get_rates":
+            result = await hospital_prices_get_rates(
+                hospital_id=args.hospital_id,
+                cpt_codes=args.cpt_codes
+            )
+        elif args.tool == "compare":
+            result = await hospital_prices_compare(
+                cpt_code=args.cpt_code,
+                location=args.location,
+                limit=args.limit,
+                zip_code=args.zip_code,
+                state=args.state
+            )
+        elif args.tool == "estimate":
+            result = await hospital_prices_estimate_cash(
+                cpt_code=args.cpt_code,
+                location=args.location,
+                zip_code=args.zip_code,
+                state=args.state
+            )
+        
+        print(_dumps(result))
+    except Exception as e:
+        print(_dumps({"error": str(e)}), file=sys.stderr)
+        sys.exit(1)
+
 
+# The CLI parser is built once, and argparse imported, only in CLI mode
+if not MCP_AVAILABLE:
+    import argparse
+    
+    _PARSER = argparse.ArgumentParser(description="Hospital Pricing MCP Server (CLI Mode)")
+    _PARSER.add_argument("--tool", required=True, choices=[
+        "search", "get_rates", "compare", "estimate"
+    ])
+    _PARSER.add_argument("--cpt_code", help="CPT code")
+    _PARSER.add_argument("--location", help="Location")
+    _PARSER.add_argument("--hospital_id", help="Hospital ID")
+    _PARSER.add_argument("--radius", type=int, help="Radius in miles")
+    _PARSER.add_argument("--limit", type=int, default=10, help="Result limit")
+    _PARSER.add_argument("--zip_code", help="ZIP code")
+    _PARSER.add_argument("--state", help="State code")
+    _PARSER.add_argument("--cpt_codes", nargs="+", help="List of CPT codes")
+    
+    main = _cli_main
+
+
+if __name__ == "__main__":
+    # uvloop (optional) cuts per-callback scheduling overhead on the stdio loop
+    try:
+        import uvloop
+        uvloop.install()
+    except ImportError:
+        pass
+    asyncio.run(main())
@@ -8,12 +8,17 @@ for searching hospital prices, comparing rates, and estimating cash prices.
 import os
 import time
 import requests
-from typing import Dict, List, Optional, Any
+from typing import Dict, FrozenSet, List, Optional, Any
 from datetime import datetime, timedelta
 import json
 import sys
 from pathlib import Path
 
+try:
+    import orjson
+except ImportError:
+    orjson = None  # type: ignore
+
 # Add common directory to path for error handling
 sys.path.insert(0, str(Path(__file__).parent.parent.parent.parent))
 
@@ -36,6 +41,13 @@ from common.cache import get_cache, build_cache_key
 API_BASE_URL = "https://api.turquoise.health"
 
 
+def _parse_json(response: "requests.Response") -> Dict[str, Any]:
+    """Decode a JSON response body, using orjson when available."""
+    if orjson is not None:
+        return orjson.loads(response.content)
+    return response.json()
+
+
 class TurquoiseHealthClient:
     """Client for interacting with Turquoise Health API."""
     
@@ -61,10 +73,24 @@ class TurquoiseHealthClient:
             "Content-Type": "application/json"
         }
         
+        # Persistent session so repeated calls reuse keep-alive connections instead
+        # of paying a TCP+TLS handshake per request. The server calls the client from
+        # up to TURQUOISE_MAX_CONCURRENCY threads, so size the pool to match.
+        pool_size = int(os.getenv("TURQUOISE_MAX_CONCURRENCY", "8"))
+        self.session = requests.Session()
+        self.session.headers.update(self.headers)
+        adapter = requests.adapters.HTTPAdapter(pool_connections=1, pool_maxsize=pool_size)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+        
         # Caching
         self.use_cache = use_cache
         self.cache = get_cache() if use_cache else None
     
+    def close(self):
+        """Close the pooled HTTP connections."""
+        self.session.close()
+    
     def _make_request(
         self,
         method: str,
@@ -113,6 +139,7 @@ class TurquoiseHealthClient:
                     params=params,
                     allow_retries=allow_retries,
                     max_retries=max_retries if allow_retries else 0,
+                    session=self.session,
                 )
             else:
                 # For non-GET requests, use CallOptions directly
@@ -124,10 +151,11 @@ class TurquoiseHealthClient:
                     headers=self.headers,
                     params=params,
                     allow_retries=False,  # POST/PUT/DELETE are not idempotent
+                    session=self.session,
                 )
                 response = call_upstream(options)
             
-            return response.json()
+            return _parse_json(response)
             
         except ApiError as e:
             # Re-raise ApiError as-is (already standardized)
@@ -154,15 +182,11 @@ class TurquoiseHealthClient:
         
         This is kept as a fallback for backward compatibility.
         """
-        import requests
-        
         url = f"{self.base_url}{endpoint}"
-        session = requests.Session()
-        session.headers.update(self.headers)
         
         for attempt in range(max_retries):
             try:
-                response = session.request(
+                response = self.session.request(
                     method=method,
                     url=url,
                     params=params,
@@ -177,7 +201,7 @@ class TurquoiseHealthClient:
                     raise Exception(f"Rate limit exceeded. Retry after {retry_after} seconds.")
                 
                 response.raise_for_status()
-                return response.json()
+                return _parse_json(response)
                 
             except requests.exceptions.Timeout:
                 if attempt < max_retries - 1:
@@ -300,7 +324,11 @@ class TurquoiseHealthClient:
                 f"/v1/hospitals/{hospital_id}/rates",
                 params=params
             )
-            result = self._normalize_rates_response(response, hospital_id)
+            result = self._normalize_rates_response(
+                response,
+                hospital_id,
+                codes=frozenset(code.strip().upper() for code in cpt_codes) if cpt_codes else None
+            )
             
             # Cache result with 24 hour TTL
             if self.use_cache and self.cache:
@@ -492,22 +520,46 @@ class TurquoiseHealthClient:
             "prices": prices
         }
     
-    def _normalize_rates_response(self, response: Dict[str, Any], hospital_id: str) -> Dict[str, Any]:
-        """Normalize hospital rates response to our schema format."""
+    def _normalize_rates_response(
+        self,
+        response: Dict[str, Any],
+        hospital_id: str,
+        codes: Optional[FrozenSet[str]] = None
+    ) -> Dict[str, Any]:
+        """
+        Normalize hospital rates response to our schema format.
+        
+        Args:
+            response: Raw rates response from the API
+            hospital_id: Turquoise Health hospital identifier
+            codes: Requested procedure codes (upper-case); when given, rows for
+                other codes are dropped before normalizing, so a full rate sheet
+                returned for a filtered request is not copied and cached whole
+        """
         hospital_info = response.get("hospital", response.get("facility", {}))
         rates = response.get("rates", response.get("data", []))
+        if codes is not None:
+            rates = [
+                rate for rate in rates
+                if str(rate.get("code", rate.get("cpt_code", ""))).strip().upper() in codes
+            ]
+        
+        # Every row of a rate sheet belongs to the same hospital, so build the
+        # hospital fields once and share them (treat rows as read-only)
+        hospital_name = hospital_info.get("name", hospital_info.get("hospital_name", ""))
+        address = {
+            "street": hospital_info.get("address", hospital_info.get("street", "")),
+            "city": hospital_info.get("city", ""),
+            "state": hospital_info.get("state", ""),
+            "zip_code": hospital_info.get("zip_code", hospital_info.get("zip", ""))
+        }
+        current_year = datetime.now().year
         
-        prices = []
-        for rate in rates:
-            price_obj = {
+        prices = [
+            {
                 "hospital_id": hospital_id,
-                "hospital_name": hospital_info.get("name", hospital_info.get("hospital_name", "")),
-                "address": {
-                    "street": hospital_info.get("address", hospital_info.get("street", "")),
-                    "city": hospital_info.get("city", ""),
-                    "state": hospital_info.get("state", ""),
-                    "zip_code": hospital_info.get("zip_code", hospital_info.get("zip", ""))
-                },
+                "hospital_name": hospital_name,
+                "address": address,
                 "procedure_code": rate.get("code", rate.get("cpt_code", "")),
                 "procedure_description": rate.get("description", rate.get("procedure_description", "")),
                 "pricing": {
@@ -515,14 +567,15 @@ class TurquoiseHealthClient:
                     "insurance_price": rate.get("insurance_price", rate.get("negotiated", None)),
                     "medicare_price": rate.get("medicare_price", rate.get("medicare", None))
                 },
-                "year": rate.get("year", datetime.now().year),
+                "year": rate.get("year", current_year),
                 "data_source": "Turquoise Health API"
             }
-            prices.append(price_obj)
+            for rate in rates
+        ]
         
         return {
             "hospital_id": hospital_id,
-            "hospital_name": hospital_info.get("name", hospital_info.get("hospital_name", "")),
+            "hospital_name": hospital_name,
             "count": len(prices),
             "prices": prices
         }
@@ -0,0 +1,190 @@
+"""
+Tests for Redis-backed memoization.
+"""
+
+import sys
+from pathlib import Path
+
+# Add project root to path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+import pytest
+
+from common.redis_memo import async_memoize, build_memo_key, memo_get_many, memo_set_many
+
+
+class FakePipeline:
+    """Queues SETEX commands and applies them on execute()."""
+
+    def __init__(self, redis_client):
+        self.redis_client = redis_client
+        self.commands = []
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+    def setex(self, key, ttl, value):
+        self.commands.append((key, ttl, value))
+        return self
+
+    async def execute(self):
+        self.redis_client.round_trips += 1
+        for key, ttl, value in self.commands:
+            await self.redis_client.setex(key, ttl, value)
+
+
+class FakeRedis:
+    """In-memory stand-in for the redis.asyncio GET/SETEX/MGET interface."""
+
+    def __init__(self, fail: bool = False):
+        self.store = {}
+        self.ttls = {}
+        self.fail = fail
+        self.round_trips = 0
+
+    async def get(self, key):
+        if self.fail:
+            raise ConnectionError("redis down")
+        return self.store.get(key)
+
+    async def setex(self, key, ttl, value):
+        if self.fail:
+            raise ConnectionError("redis down")
+        self.store[key] = value
+        self.ttls[key] = ttl
+
+    async def mget(self, keys):
+        if self.fail:
+            raise ConnectionError("redis down")
+        self.round_trips += 1
+        return [self.store.get(key) for key in keys]
+
+    def pipeline(self, transaction=True):
+        return FakePipeline(self)
+
+
+class TestBuildMemoKey:
+    """Test memo key construction."""
+
+    def test_key_is_namespaced_and_order_independent(self):
+        """Test that keys carry the namespace and ignore dict ordering."""
+        key = build_memo_key("server:tool", {"a": 1, "b": 2})
+
+        assert key.startswith("server:tool:")
+        assert key == build_memo_key("server:tool", {"b": 2, "a": 1})
+        assert key != build_memo_key("server:other", {"a": 1, "b": 2})
+
+
+class TestAsyncMemoize:
+    """Test the async_memoize decorator."""
+
+    @pytest.mark.asyncio
+    async def test_second_call_served_from_redis(self):
+        """Test that a repeated call returns the stored result without re-running."""
+        redis_client = FakeRedis()
+        calls = []
+
+        @async_memoize("test:search", ttl=60, client=redis_client)
+        async def search(code):
+            calls.append(code)
+            return {"code": code, "prices": [1, 2]}
+
+        assert await search("99213") == {"code": "99213", "prices": [1, 2]}
+        assert await search("99213") == {"code": "99213", "prices": [1, 2]}
+        assert calls == ["99213"]
+        assert list(redis_client.ttls.values()) == [60]
+
+    @pytest.mark.asyncio
+    async def test_error_responses_not_memoized(self):
+        """Test that results carrying an error are not stored."""
+        redis_client = FakeRedis()
+
+        @async_memoize("test:search", ttl=60, client=redis_client)
+        async def search(code):
+            return {"error": {"code": "UPSTREAM_ERROR"}}
+
+        await search("99213")
+
+        assert redis_client.store == {}
+
+    @pytest.mark.asyncio
+    async def test_redis_failure_falls_back_to_call(self):
+        """Test that an unreachable Redis does not break the wrapped call."""
+        calls = []
+
+        @async_memoize("test:search", ttl=60, client=FakeRedis(fail=True))
+        async def search(code):
+            calls.append(code)
+            return {"code": code}
+
+        assert await search("99213") == {"code": "99213"}
+        assert await search("99213") == {"code": "99213"}
+        assert calls == ["99213", "99213"]
+
+    @pytest.mark.asyncio
+    async def test_key_func_selects_key_arguments(self):
+        """Test that key_func controls which arguments identify a call."""
+        redis_client = FakeRedis()
+        calls = []
+
+        @async_memoize(
+            "test:search", ttl=60, client=redis_client, key_func=lambda code, request_id: code
+        )
+        async def search(code, request_id):
+            calls.append(request_id)
+            return {"code": code}
+
+        await search("99213", "req-1")
+        await search("99213", "req-2")
+
+        assert calls == ["req-1"]
+
+    @pytest.mark.asyncio
+    async def test_passthrough_without_redis(self, monkeypatch):
+        """Test that calls go straight through when REDIS_URL is unset."""
+        from common import redis_memo
+
+        monkeypatch.delenv("REDIS_URL", raising=False)
+        redis_memo.get_redis_client.cache_clear()
+        calls = []
+
+        @async_memoize("test:search", ttl=60)
+        async def search(code):
+            calls.append(code)
+            return {"code": code}
+
+        await search("99213")
+        await search("99213")
+
+        assert calls == ["99213", "99213"]
+        redis_memo.get_redis_client.cache_clear()
+
+
+class TestBulkMemo:
+    """Test memo_get_many and memo_set_many."""
+
+    @pytest.mark.asyncio
+    async def test_set_then_get_many_in_one_round_trip_each(self):
+        """Test that bulk writes and reads each take a single round-trip."""
+        redis_client = FakeRedis()
+        keys = [build_memo_key("test:cms", code) for code in ("99213", "27447", "J1100")]
+
+        await memo_set_many({keys[0]: {"price": 1.5}, keys[2]: {"price": 3.0}}, 3600, client=redis_client)
+        values = await memo_get_many(keys, client=redis_client)
+
+        assert values == [{"price": 1.5}, None, {"price": 3.0}]
+        assert redis_client.round_trips == 2
+        assert set(redis_client.ttls.values()) == {3600}
+
+    @pytest.mark.asyncio
+    async def test_redis_failure_reads_as_misses(self):
+        """Test that an unreachable Redis yields misses instead of raising."""
+        redis_client = FakeRedis(fail=True)
+
+        await memo_set_many({"test:cms:a": {"price": 1.5}}, 3600, client=redis_client)
+
+        assert await memo_get_many(["test:cms:a", "test:cms:b"], client=redis_client) == [None, None]
@@ -0,0 +1,137 @@
+"""
+Unit tests for the Hospital Pricing SQLite cache.
+"""
+
+import importlib.util
+import sqlite3
+from pathlib import Path
+
+import pytest
+
+pytestmark = [pytest.mark.unit, pytest.mark.python]
+
+# Load the server's cache.py under its own name: several servers ship a
+# top-level "cache" module, so a plain import could pick up the wrong one
+_spec = importlib.util.spec_from_file_location(
+    "hospital_prices_cache",
+    Path(__file__).parent.parent.parent / "servers" / "pricing" / "hospital-prices-mcp" / "cache.py"
+)
+hospital_cache = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(hospital_cache)
+Cache = hospital_cache.Cache
+
+
+@pytest.fixture
+def cache_file(tmp_path):
+    """Path to a fresh SQLite cache file."""
+    return str(tmp_path / "cache.db")
+
+
+@pytest.fixture
+def cache(cache_file):
+    """Cache backed by a temporary file, closed after the test."""
+    cache = Cache(cache_file=cache_file)
+    yield cache
+    cache.close()
+
+
+def _row_count(cache_file):
+    conn = sqlite3.connect(cache_file)
+    try:
+        return conn.execute("SELECT COUNT(*) FROM cache").fetchone()[0]
+    finally:
+        conn.close()
+
+
+class TestHospitalCache:
+    """Test the hospital prices Cache."""
+
+    def test_migrates_text_timestamp_schema(self, cache_file):
+        """Test that a table with the old ISO-8601 text timestamps is rebuilt."""
+        conn = sqlite3.connect(cache_file)
+        conn.execute("""
+            CREATE TABLE cache (
+                key TEXT PRIMARY KEY,
+                value TEXT NOT NULL,
+                created_at TEXT NOT NULL,
+                expires_at TEXT NOT NULL
+            )
+        """)
+        conn.execute(
+            "INSERT INTO cache VALUES (?, ?, ?, ?)",
+            ("old", '{"v": 1}', "2024-01-01T00:00:00", "2099-01-01T00:00:00")
+        )
+        conn.commit()
+        conn.close()
+
+        cache = Cache(cache_file=cache_file)
+        try:
+            conn = sqlite3.connect(cache_file)
+            columns = {name: col_type for _, name, col_type, *_ in conn.execute("PRAGMA table_info(cache)")}
+            conn.close()
+            assert columns["created_at"] == "INTEGER"
+            assert columns["expires_at"] == "INTEGER"
+            assert _row_count(cache_file) == 0
+
+            cache.set("/v1/search", {"code": "99213"}, {"v": 2})
+            assert cache.get("/v1/search", {"code": "99213"}) == {"v": 2}
+        finally:
+            cache.close()
+
+    def test_get_from_memory_and_after_flush_from_sqlite(self, cache, cache_file):
+        """Test that a set is readable from memory at once and from SQLite after flush."""
+        cache.set("/v1/search", {"code": "99213"}, {"v": 2})
+        assert cache.get("/v1/search", {"code": "99213"}) == {"v": 2}
+
+        cache.flush()
+        assert _row_count(cache_file) == 1
+
+        reopened = Cache(cache_file=cache_file)
+        try:
+            assert reopened.get("/v1/search", {"code": "99213"}) == {"v": 2}
+        finally:
+            reopened.close()
+
+    def test_hits_return_independent_copies(self, cache):
+        """Test that mutating a returned value does not change the cached entry."""
+        cache.set("/v1/search", {"code": "99213"}, {"v": 2})
+
+        value = cache.get("/v1/search", {"code": "99213"})
+        value["v"] = 99
+
+        assert cache.get("/v1/search", {"code": "99213"}) == {"v": 2}
+
+    def test_expired_entries_are_not_returned(self, cache):
+        """Test that entries past their TTL are misses in memory and SQLite."""
+        cache.ttl_hours = 0
+        cache.set("/v1/search", {"code": "99213"}, {"v": 2})
+        cache.flush()
+
+        assert cache.get("/v1/search", {"code": "99213"}) is None
+
+    def test_purge_returns_deleted_counts(self, cache):
+        """Test purge() row counts for expired-only and full cleanup."""
+        cache.ttl_hours = 0
+        cache.set("/v1/search", {"code": "1"}, {"v": 1})
+        cache.set("/v1/search", {"code": "2"}, {"v": 2})
+        cache.ttl_hours = 24
+        cache.set("/v1/search", {"code": "3"}, {"v": 3})
+
+        assert cache.purge(expired_only=True) == 2
+        assert cache.get("/v1/search", {"code": "3"}) == {"v": 3}
+        assert cache.purge(expired_only=False) == 1
+        assert cache.get("/v1/search", {"code": "3"}) is None
+
+    def test_close_drains_queued_writes(self, cache_file):
+        """Test that close() writes every queued set before returning."""
+        cache = Cache(cache_file=cache_file)
+        for i in range(100):
+            cache.set("/v1/search", {"code": str(i)}, {"v": i})
+
+        cache.close()
+        cache.close()
+
+        assert _row_count(cache_file) == 100
+        with pytest.raises(RuntimeError):
+            cache.set("/v1/search", {"code": "x"}, {"v": 0})
+        cache.flush()
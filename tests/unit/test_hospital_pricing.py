@@ -13,6 +13,15 @@ sys.path.insert(0, str(Path(__file__).parent.parent.parent / "servers" / "pricin
 pytestmark = [pytest.mark.unit, pytest.mark.python]
 
 
+@pytest.fixture(autouse=True)
+def _clear_tool_cache():
+    """Drop cached tool results so each test sees its own mocked client."""
+    yield
+    server = sys.modules.get("server")
+    if server is not None and hasattr(server, "cache_clear"):
+        server.cache_clear()
+
+
 class TestHospitalPricingServer:
     """Test Hospital Pricing MCP Server functionality."""
     
@@ -127,6 +136,160 @@ class TestHospitalPricingServer:
             
             assert "estimate" in result or "error" in result
     
+    @pytest.mark.asyncio
+    async def test_repeated_search_served_from_cache(self, sample_hospital_price):
+        """Test that identical searches share one API call and limits don't leak."""
+        from server import hospital_prices_search_procedure, cache_info
+        
+        with patch("server.get_client") as mock_get_client:
+            mock_client = Mock()
+            mock_get_client.return_value = mock_client
+            mock_client.search_procedure_price.return_value = {
+                "count": 2,
+                "total": 2,
+                "prices": [sample_hospital_price, sample_hospital_price]
+            }
+            
+            limited = await hospital_prices_search_procedure(
+                cpt_code="99213", location="Boston, MA", zip_code="2115", limit=1
+            )
+            full = await hospital_prices_search_procedure(
+                cpt_code="99213", location="boston, ma", zip_code="02115"
+            )
+            
+            # The shared entry was fetched with the canonical query both calls map to
+            mock_client.search_procedure_price.assert_called_once_with(
+                cpt_code="99213",
+                location="boston, ma",
+                radius=None,
+                zip_code="02115",
+                state=None
+            )
+            assert limited["count"] == 1
+            assert full["count"] == 2
+            assert cache_info()["hits"] == 1
+    
+    @pytest.mark.asyncio
+    async def test_concurrent_identical_calls_share_one_request(self):
+        """Test that concurrent identical rate lookups issue a single API call."""
+        import asyncio
+        import threading
+        from server import hospital_prices_get_rates
+        
+        release = threading.Event()
+        
+        def slow_rates(**kwargs):
+            release.wait(timeout=5)
+            return {"hospital_id": "test_123", "count": 0, "prices": []}
+        
+        with patch("server.get_client") as mock_get_client:
+            mock_client = Mock()
+            mock_get_client.return_value = mock_client
+            mock_client.get_hospital_rates.side_effect = slow_rates
+            
+            calls = asyncio.gather(*(
+                hospital_prices_get_rates(hospital_id="test_123", cpt_codes=["99213"])
+                for _ in range(3)
+            ))
+            await asyncio.sleep(0.05)
+            release.set()
+            results = await calls
+            
+            assert mock_client.get_hospital_rates.call_count == 1
+            assert all(result["hospital_id"] == "test_123" for result in results)
+    
+    def test_input_validation_uses_tool_schema(self):
+        """Test that tool arguments are checked against the tool's input schema."""
+        from server import _validate_input
+        from common.errors import ValidationError
+        
+        _validate_input("hospital_prices_search_procedure", {"cpt_code": "99213"})
+        
+        with pytest.raises(ValidationError):
+            _validate_input("hospital_prices_compare", {"cpt_code": "99213"})
+
+    def test_output_validation_uses_tool_schema(self, monkeypatch):
+        """Test that strict output validation checks results against the tool's output schema."""
+        from server import _validate_output
+        from common.errors import ValidationError
+
+        monkeypatch.setenv("MCP_STRICT_OUTPUT_VALIDATION", "true")
+        _validate_output("hospital_prices_search_procedure", {"count": 0, "prices": []})
+
+        with pytest.raises(ValidationError):
+            _validate_output("hospital_prices_search_procedure", {"count": 0})
+
+        monkeypatch.setenv("MCP_STRICT_OUTPUT_VALIDATION", "false")
+        _validate_output("hospital_prices_search_procedure", {"count": 0})
+
+    def test_validation_leaves_arguments_and_results_unchanged(self, monkeypatch):
+        """Test that schema defaults are not written into validated dicts."""
+        from server import _validate_input, _validate_output
+
+        search_args = {"cpt_code": "99213"}
+        compare_args = {"cpt_code": "99213", "location": "Boston, MA"}
+        _validate_input("hospital_prices_search_procedure", search_args)
+        _validate_input("hospital_prices_compare", compare_args)
+
+        assert search_args == {"cpt_code": "99213"}
+        assert compare_args == {"cpt_code": "99213", "location": "Boston, MA"}
+
+        monkeypatch.setenv("MCP_STRICT_OUTPUT_VALIDATION", "true")
+        result = {"count": 0, "prices": []}
+        _validate_output("hospital_prices_search_procedure", result)
+
+        assert result == {"count": 0, "prices": []}
+
+    def test_cache_keys_are_canonicalized(self):
+        """Test that equivalent location spellings share a cache key."""
+        from server import _location_key
+
+        key = _location_key("Boston, MA", "02115", "MA")
+        assert _location_key(" boston,ma ", "2115", "ma ") == key
+        assert _location_key("Boston ,  MA", " 02115", "Ma") == key
+        assert _location_key("Cambridge, MA", "02115", "MA") != key
+
+    def test_get_client_is_memoized(self):
+        """Test that the Turquoise client is created once and reused."""
+        from server import get_client
+
+        get_client.cache_clear()
+        try:
+            with patch("server.get_config") as mock_get_config, \
+                 patch("server.TurquoiseHealthClient") as mock_client_cls:
+                mock_get_config.return_value = Mock(turquoise_api_key="test-key")
+
+                assert get_client() is get_client()
+                mock_client_cls.assert_called_once_with(api_key="test-key")
+        finally:
+            get_client.cache_clear()
+
+    def test_insured_oop_calc_per_plan(self):
+        """Test the specialized per-plan OOP calculation and its reuse."""
+        from server import _insured_oop_calc
+
+        assert _insured_oop_calc(25.0, 500.0, 0.2, 1000.0)(800.0) == (25.0, 25.0)
+        assert _insured_oop_calc(None, 500.0, 0.2, 1000.0)(800.0) == (560.0, 560.0)
+        assert _insured_oop_calc(None, 0.0, 0.2, 100.0)(800.0) == (160.0, 100.0)
+        assert _insured_oop_calc(None, 0.0, 0.2, 100.0) is _insured_oop_calc(None, 0.0, 0.2, 100.0)
+
+    def test_rates_response_filtered_to_requested_codes(self):
+        """Test that rows for codes the caller did not request are dropped."""
+        from turquoise_client import TurquoiseHealthClient
+
+        client = TurquoiseHealthClient(api_key="test-key", use_cache=False)
+        response = {
+            "hospital": {"name": "General"},
+            "rates": [{"code": "99213", "cash": 150.0}, {"code": "27447", "cash": 30000.0}]
+        }
+
+        filtered = client._normalize_rates_response(response, "h1", codes=frozenset({"99213"}))
+        full = client._normalize_rates_response(response, "h1")
+
+        assert [p["procedure_code"] for p in filtered["prices"]] == ["99213"]
+        assert filtered["count"] == 1
+        assert full["count"] == 2
+
     @pytest.mark.asyncio
     async def test_error_handling(self):
         """Test error handling."""